@@ -1,3 +1,7 @@
+from typing import List
+
+import numpy as np
+
 def LevenshteinDistance(source:str, target:str):
     m = len(source)
     n = len(target)
@@ -23,14 +27,118 @@ def LevenshteinDistance(source:str, target:str):
     return matrix[n][m]
 
 
+def levenshtein_within(a: str, b: str, k: int) -> bool:
+    """
+        Return whether the edit distance between a and b is at most k.
+
+        Only the diagonal band |i - j| <= k is computed, with two rolling
+        rows, and the loop stops as soon as a whole band row exceeds k.
+        Unlike LevenshteinDistance the comparison is case-sensitive, so
+        callers should lowercase both strings once up front.
+    """
+    n = len(a)
+    m = len(b)
+
+    if abs(n - m) > k:
+        return False
+    if k == 0:
+        return a == b
+
+    # Any value above k means "too far", so out-of-band cells hold k + 1
+    big = k + 1
+    prev = [j if j <= k else big for j in range(m + 1)]
+    cur = [big] * (m + 1)
+
+    for i in range(1, n + 1):
+        lo = max(1, i - k)
+        hi = min(m, i + k)
+
+        # Cells just outside the band may still hold values from two rows ago
+        cur[lo - 1] = i if lo == 1 and i <= k else big
+        if hi == i + k:
+            prev[hi] = big
+
+        ch = a[i - 1]
+        row_min = cur[lo - 1]
+        left = row_min
+        for j in range(lo, hi + 1):
+            value = prev[j - 1] if b[j - 1] == ch else prev[j - 1] + 1
+            if prev[j] + 1 < value:
+                value = prev[j] + 1
+            if left + 1 < value:
+                value = left + 1
+            cur[j] = value
+            left = value
+            if value < row_min:
+                row_min = value
+
+        if row_min > k:
+            return False
+
+        prev, cur = cur, prev
+
+    return prev[m] <= k
+
+
+def levenshtein_within_batch(pattern: str, candidates: List[str], k: int) -> List[bool]:
+    """
+        levenshtein_within(pattern, candidate, k) for many candidates at once.
+
+        Candidates are padded into one NumPy array and every dynamic
+        programming row is computed for all of them together; the
+        left-to-right dependency inside a row is resolved with a running
+        minimum. Input should already be lowercased.
+    """
+    result = [False] * len(candidates)
+
+    # Only candidates whose length is within k of the pattern can match
+    indices = [idx for idx, candidate in enumerate(candidates) if abs(len(candidate) - len(pattern)) <= k]
+    if not indices:
+        return result
+
+    lengths = np.array([len(candidates[idx]) for idx in indices])
+    width = int(lengths.max())
+
+    # Code points, padded with -1 so padding never equals a pattern character
+    chars = np.full((len(indices), width), -1, dtype=np.int64)
+    for row, idx in enumerate(indices):
+        candidate = candidates[idx]
+        chars[row, :len(candidate)] = [ord(ch) for ch in candidate]
+
+    columns = np.arange(width + 1)
+    prev = np.broadcast_to(columns, (len(indices), width + 1)).copy()
+
+    for i, ch in enumerate(pattern, 1):
+        cost = (chars != ord(ch)).astype(np.int64)
+
+        # Diagonal and vertical moves, then horizontal moves via cur[j] = min(t[l] + j - l)
+        cur = np.empty_like(prev)
+        cur[:, 0] = i
+        cur[:, 1:] = np.minimum(prev[:, :-1] + cost, prev[:, 1:] + 1)
+        cur = np.minimum.accumulate(cur - columns, axis=1) + columns
+
+        if cur.min() > k:
+            return result
+        prev = cur
+
+    distances = prev[np.arange(len(indices)), lengths]
+    for idx, distance in zip(indices, distances):
+        result[idx] = bool(distance <= k)
+
+    return result
+
+
 def fuzzy_search(text, pattern, max_distance=2):
     pattern_len = len(pattern)
     match = 0
 
+    # LevenshteinDistance compared characters case-insensitively
+    text = text.lower()
+    pattern = pattern.lower()
+
     for i in range(len(text) - pattern_len + 1):
         substring = text[i:i+pattern_len]
-        distance = LevenshteinDistance(substring, pattern)
-        if distance <= max_distance:
+        if levenshtein_within(substring, pattern, max_distance):
             match += 1
     
     return match
@@ -0,0 +1,102 @@
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class AhoCorasick:
+    """
+        Aho-Corasick automaton that counts the occurrences of many keywords
+        in a single pass over the text
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.terminals: Dict[str, int] = {}
+
+        for pattern in patterns:
+            if pattern and pattern not in self.terminals:
+                self.terminals[pattern] = self._insert(pattern)
+
+        self.order = self._build_failure_links()
+
+        # Patterns ending at each node, including those reached through failure links
+        self.outputs: List[Tuple[str, ...]] = [()] * len(self.goto)
+        for pattern, node in self.terminals.items():
+            self.outputs[node] = (pattern,)
+        for node in self.order:
+            self.outputs[node] += self.outputs[self.fail[node]]
+
+    def _insert(self, pattern: str) -> int:
+        node = 0
+        for ch in pattern:
+            next_node = self.goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][ch] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+            node = next_node
+        return node
+
+    def _build_failure_links(self) -> List[int]:
+        # Breadth-first so every failure target is final before it is used
+        order = []
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for ch, child in self.goto[node].items():
+                fallback = self.fail[node]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(ch, 0)
+                queue.append(child)
+        return order
+
+    def count_all(self, text: str) -> Dict[str, int]:
+        """
+            Count the (possibly overlapping) occurrences of every pattern in text
+        """
+        goto = self.goto
+        fail = self.fail
+        hits = [0] * len(goto)
+
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hits[node] += 1
+
+        # A visit to a node is also an occurrence of every pattern on its failure chain
+        for node in reversed(self.order):
+            hits[fail[node]] += hits[node]
+
+        return {pattern: hits[node] for pattern, node in self.terminals.items()}
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+            Yield (end index, pattern) for every (possibly overlapping) occurrence
+        """
+        goto = self.goto
+        fail = self.fail
+        outputs = self.outputs
+
+        node = 0
+        for j, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pattern in outputs[node]:
+                yield j, pattern
+
+
+def aho_corasick_search(patterns: Iterable[str], text: str) -> Dict[str, int]:
+    automaton = AhoCorasick(patterns)
+    return automaton.count_all(text)
+
+
+if __name__ == "__main__":
+    text = "saya suka python python dan pyrthonpythonp"
+    res = aho_corasick_search(["python", "on", "py"], text)
+    print(res)
@@ -0,0 +1,6 @@
+"""
+    Benchmarks for the matching engines, PDF extraction and the end-to-end
+    search path. Run from the src directory:
+
+        python -m benchmarks --help
+"""
@@ -0,0 +1,93 @@
+import argparse
+import contextlib
+import io
+
+from benchmarks import engines, extraction, search
+from benchmarks.common import (DATA_DIR, compare, environment, find_pdfs, print_results,
+                               save_results, synthetic_texts)
+
+SUITES = ("engines", "extraction", "search")
+
+
+def parse_ints(value: str):
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def load_corpus_texts(limit: int):
+    # Clean texts of the bundled CVs, extracted once into the shared text cache
+    from text_cache import PDFTextCache
+
+    cache = PDFTextCache()
+    with contextlib.redirect_stdout(io.StringIO()):
+        texts = [cache.get_text(path, clean=True) for path in find_pdfs(DATA_DIR, limit)]
+    cache.flush()
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the matching engines, PDF extraction and search')
+    parser.add_argument('suites', nargs='*', metavar='suite',
+                        help=f'Suites to run: {", ".join(SUITES)} (default: all)')
+    parser.add_argument('--corpus', choices=['synthetic', 'data', 'both'], default='both',
+                        help='Texts for the engine benchmarks')
+    parser.add_argument('--synthetic-mb', type=float, default=1.0, help='Total size of the synthetic texts')
+    parser.add_argument('--doc-kb', type=float, default=8.0, help='Size of one synthetic document')
+    parser.add_argument('--docs', type=int, default=200, help='Number of data/ CVs for the engine benchmarks')
+    parser.add_argument('--extract-docs', type=int, default=20, help='Number of data/ PDFs to extract')
+    parser.add_argument('--pattern-lengths', type=parse_ints, default=[4, 8, 16, 32])
+    parser.add_argument('--keyword-counts', type=parse_ints, default=[1, 5, 20])
+    parser.add_argument('--queries', help='Search queries separated by ";" (keywords inside a query by ",")')
+    parser.add_argument('--algorithms', help='Comma-separated search algorithms (default: KMP,BM,AC,INDEX,SA)')
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('-w', '--workers', type=int, help='Search worker processes (default: SEARCH_WORKERS)')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Repetitions per benchmark')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help='JSON file to write (default: .cache/benchmarks/<time>-<commit>.json)')
+    parser.add_argument('--compare', help='Earlier JSON result to compare against')
+    args = parser.parse_args()
+
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite: {', '.join(sorted(unknown))}")
+    suites = args.suites or list(SUITES)
+    results = []
+
+    if "engines" in suites:
+        if args.corpus in ("synthetic", "both"):
+            texts = synthetic_texts(args.synthetic_mb, args.doc_kb, args.seed)
+            results += engines.run("synthetic", texts, args.pattern_lengths, args.keyword_counts,
+                                   args.repeat, args.seed)
+        if args.corpus in ("data", "both"):
+            try:
+                texts = load_corpus_texts(args.docs)
+            except Exception as e:
+                results.append({"name": "engines/data", "suite": "engines", "error": str(e)})
+            else:
+                results += engines.run("data", texts, args.pattern_lengths, args.keyword_counts,
+                                       args.repeat, args.seed)
+
+    if "extraction" in suites:
+        try:
+            results += extraction.run(find_pdfs(DATA_DIR, args.extract_docs), args.repeat)
+        except Exception as e:
+            results.append({"name": "extraction", "suite": "extraction", "error": str(e)})
+
+    if "search" in suites:
+        queries = args.queries.split(";") if args.queries else None
+        algorithms = [a.strip().upper() for a in args.algorithms.split(",")] if args.algorithms else None
+        try:
+            results += search.run(queries, algorithms, args.top_n, args.repeat, args.workers)
+        except Exception as e:
+            results.append({"name": "search", "suite": "search", "error": str(e)})
+
+    print_results(results)
+
+    output = save_results({"environment": environment(), "args": vars(args), "results": results}, args.output)
+    print(f"\nResults saved to: {output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(SRC_DIR)
+DATA_DIR = os.path.join(REPO_DIR, "data")
+DEFAULT_RESULTS_DIR = os.path.join(REPO_DIR, ".cache", "benchmarks")
+
+# Words common in the bundled CVs, so synthetic text has realistic term lengths
+VOCABULARY = (
+    "experience management skills project team customer sales service business "
+    "development data analysis software python java sql accounting finance "
+    "marketing communication leadership training education university degree "
+    "engineering design quality operations support planning budget reporting "
+    "microsoft office excel research administration healthcare patient safety"
+).split()
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[int(fraction * (len(sorted_values) - 1))]
+
+
+def measure(name: str, items: Iterable, run: Callable, size_of: Callable = len,
+            repeat: int = 1, docs_per_item: int = 1, **info) -> dict:
+    """
+        Time run(item) for every item, repeat times, and summarize throughput
+        (MB/s, docs/s) and per-item latency percentiles.
+
+        docs_per_item is the number of documents one run covers, e.g. every
+        document of the corpus for a whole-corpus scan or index query, so
+        docs/s stays comparable with the per-document rows.
+    """
+    items = list(items)
+    samples = []
+    total_bytes = 0
+    for _ in range(repeat):
+        for item in items:
+            start = time.perf_counter()
+            run(item)
+            samples.append(time.perf_counter() - start)
+            total_bytes += size_of(item)
+
+    samples.sort()
+    seconds = sum(samples)
+    result = {"name": name, **info, "docs": len(items) * docs_per_item, "repeat": repeat,
+              "bytes": total_bytes, "seconds": round(seconds, 6)}
+    result.update(throughput(total_bytes, len(samples) * docs_per_item, seconds))
+    result.update(latency(samples))
+    return result
+
+
+def throughput(total_bytes: int, docs: int, seconds: float) -> dict:
+    return {
+        "mb_per_s": round(total_bytes / seconds / 1e6, 3) if seconds else None,
+        "docs_per_s": round(docs / seconds, 3) if seconds else None,
+    }
+
+
+def latency(sorted_samples: List[float]) -> dict:
+    return {
+        "p50_ms": round(percentile(sorted_samples, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(sorted_samples, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(sorted_samples, 0.99) * 1000, 4),
+        "max_ms": round(sorted_samples[-1] * 1000, 4) if sorted_samples else 0.0,
+    }
+
+
+def synthetic_texts(total_mb: float, doc_kb: float, seed: int = 0) -> List[str]:
+    """Clean-text-like documents of random vocabulary words"""
+    rng = random.Random(seed)
+    doc_size = max(1, int(doc_kb * 1024))
+    doc_count = max(1, int(total_mb * 1024 * 1024 / doc_size))
+
+    texts = []
+    for _ in range(doc_count):
+        words = []
+        size = 0
+        while size < doc_size:
+            word = rng.choice(VOCABULARY) if rng.random() < 0.8 else str(rng.randint(1, 9999))
+            words.append(word)
+            size += len(word) + 1
+        texts.append(" ".join(words)[:doc_size])
+    return texts
+
+
+def find_pdfs(data_dir: str = DATA_DIR, limit: Optional[int] = None) -> List[str]:
+    pdfs = []
+    for root, _, files in os.walk(data_dir):
+        pdfs.extend(os.path.join(root, name) for name in files if name.lower().endswith(".pdf"))
+    pdfs.sort()
+    return pdfs[:limit] if limit else pdfs
+
+
+def sample_patterns(texts: List[str], length: int, count: int, seed: int = 0) -> List[str]:
+    """
+        count distinct patterns of the given length cut from the texts at word
+        starts, so every pattern occurs at least once
+    """
+    rng = random.Random(seed + length)
+    candidates = [text for text in texts if len(text) > length]
+    patterns = []
+    for _ in range(count * 20):
+        if len(patterns) == count or not candidates:
+            break
+        text = rng.choice(candidates)
+        start = text.rfind(" ", 0, rng.randrange(len(text) - length)) + 1
+        pattern = text[start:start + length].strip()
+        if len(pattern) == length and pattern not in patterns:
+            patterns.append(pattern)
+    return patterns
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def save_results(results: dict, output: Optional[str] = None) -> str:
+    if output is None:
+        commit = results["environment"].get("commit") or "nocommit"
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(DEFAULT_RESULTS_DIR, f"{stamp}-{commit}.json")
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    return output
+
+
+def print_results(results: List[dict]):
+    for result in results:
+        if "error" in result:
+            print(f"{result['name']:<48} skipped: {result['error']}")
+            continue
+        mb_per_s = result.get("mb_per_s")
+        mb = f"{mb_per_s:>9.2f} MB/s" if mb_per_s is not None else " " * 14
+        line = (f"{result['name']:<48} {mb} {result['docs_per_s'] or 0:>10.1f} docs/s  "
+                f"p50 {result['p50_ms']:.3f} ms  p95 {result['p95_ms']:.3f} ms")
+        if "parity_word_f1" in result:
+            line += f"  parity: word F1 {result['parity_word_f1']:.3f}, identical {result['parity_identical']:.0%}"
+        print(line)
+
+
+def compare(baseline_file: str, results: List[dict]):
+    """Print the docs/s ratio and p95 change of each benchmark against a saved run"""
+    with open(baseline_file, "r", encoding="utf-8") as f:
+        baseline = {result["name"]: result for result in json.load(f)["results"]}
+
+    print(f"\nCompared with {baseline_file}")
+    for result in results:
+        before = baseline.get(result["name"])
+        if before is None or "error" in result or "error" in before or not before.get("docs_per_s"):
+            continue
+        speedup = result["docs_per_s"] / before["docs_per_s"]
+        print(f"{result['name']:<48} {speedup:>6.2f}x docs/s  "
+              f"p95 {before['p95_ms']:.3f} -> {result['p95_ms']:.3f} ms")
@@ -0,0 +1,101 @@
+import os
+import shutil
+import tempfile
+from typing import List
+
+from aho_corasick import AhoCorasick
+from boyer_moore import BoyerMooreMatcher
+from corpus_store import CorpusStore, code_points, write_corpus
+from inverted_index import InvertedIndex
+from kmp import KMPMatcher
+from LevenshteinDistance import fuzzy_search
+from myers import MyersMatcher
+from suffix_array import SuffixArray
+
+from benchmarks.common import measure, sample_patterns
+
+# fuzzy_search is a sliding window of full edit-distance checks; keep it to a few documents
+LEGACY_FUZZY_DOCS = 20
+
+
+def run(corpus: str, texts: List[str], pattern_lengths: List[int], keyword_counts: List[int],
+        repeat: int = 1, seed: int = 0) -> List[dict]:
+    """
+        Benchmark every matching engine on the given clean texts, once per
+        pattern length, and the multi-keyword engines once per keyword count
+    """
+    results = []
+    index = InvertedIndex()
+    for doc_id, text in enumerate(texts):
+        index.add_document(str(doc_id), text)
+    corpus_bytes = sum(len(text) for text in texts)
+
+    corpus_dir = tempfile.mkdtemp(prefix="juliuscv-bench-")
+    corpus_file = os.path.join(corpus_dir, "corpus.bin")
+    try:
+        write_corpus(((str(doc_id), text) for doc_id, text in enumerate(texts)), corpus_file)
+        with CorpusStore(corpus_file) as store:
+            suffix_array = SuffixArray.build(store)
+            results += _run(corpus, texts, pattern_lengths, keyword_counts, repeat, seed, index, corpus_bytes,
+                            store, suffix_array)
+    finally:
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+    return results
+
+
+def _run(corpus, texts, pattern_lengths, keyword_counts, repeat, seed, index, corpus_bytes, store,
+         suffix_array) -> List[dict]:
+    results = []
+
+    for length in pattern_lengths:
+        patterns = sample_patterns(texts, length, max(keyword_counts), seed)
+        if not patterns:
+            continue
+        pattern = patterns[0]
+        info = {"suite": "engines", "corpus": corpus, "pattern_length": length, "keywords": 1}
+
+        kmp = KMPMatcher(pattern)
+        results.append(measure(f"engines/{corpus}/kmp/len={length}", texts, kmp.count,
+                               repeat=repeat, engine="kmp", **info))
+
+        bm = BoyerMooreMatcher(pattern)
+        results.append(measure(f"engines/{corpus}/bm/len={length}", texts, bm.count,
+                               repeat=repeat, engine="bm", **info))
+
+        myers = MyersMatcher(pattern)
+        results.append(measure(f"engines/{corpus}/myers/len={length}", texts, myers.count,
+                               repeat=repeat, engine="myers", **info))
+
+        # The corpus store rows scan every document as one memory-mapped buffer
+        for engine, matcher in (("kmp", KMPMatcher(code_points(pattern))), ("bm", BoyerMooreMatcher(code_points(pattern))),
+                                ("myers", MyersMatcher(code_points(pattern)))):
+            results.append(measure(f"engines/{corpus}/corpus-{engine}/len={length}", [matcher], store.count,
+                                   size_of=lambda _: store.size, repeat=repeat, docs_per_item=len(texts),
+                                   engine=f"corpus-{engine}", **info))
+
+        results.append(measure(f"engines/{corpus}/levenshtein/len={length}", texts[:LEGACY_FUZZY_DOCS],
+                               lambda text: fuzzy_search(text, pattern),
+                               repeat=1, engine="levenshtein", **info))
+
+        # One query answers for the whole corpus, so bytes and documents are the corpus per query
+        results.append(measure(f"engines/{corpus}/index/len={length}", [pattern], index.count,
+                               size_of=lambda _: corpus_bytes, repeat=max(repeat, 5), docs_per_item=len(texts),
+                               engine="index", **info))
+        results.append(measure(f"engines/{corpus}/sa/len={length}", [pattern], suffix_array.count,
+                               size_of=lambda _: corpus_bytes, repeat=max(repeat, 5), docs_per_item=len(texts),
+                               engine="sa", **info))
+
+        for count in keyword_counts:
+            keywords = patterns[:count]
+            info = dict(info, keywords=len(keywords))
+
+            automaton = AhoCorasick(keywords)
+            results.append(measure(f"engines/{corpus}/ac/len={length}/kw={len(keywords)}", texts,
+                                   automaton.count_all, repeat=repeat, engine="ac", **info))
+
+            matchers = [KMPMatcher(keyword) for keyword in keywords]
+            results.append(measure(f"engines/{corpus}/kmp-each/len={length}/kw={len(keywords)}", texts,
+                                   lambda text: [matcher.count(text) for matcher in matchers],
+                                   repeat=repeat, engine="kmp-each", **info))
+
+    return results
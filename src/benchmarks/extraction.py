@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+from collections import Counter
+from typing import Dict, List
+
+from pdf_engines import PDFPLUMBER, available_engines
+from pdf_extractor import PDFTextExtractor
+from text_cache import PDFTextCache
+
+from benchmarks.common import measure
+
+
+def run(pdf_paths: List[str], repeat: int = 1) -> List[dict]:
+    """
+        Benchmark every installed PDF engine and cold/warm text cache lookups.
+        Throughput is measured in PDF bytes. Engine results also report their
+        parity with pdfplumber's clean text.
+    """
+    info = {"suite": "extraction", "corpus": "data"}
+    pdf_size = os.path.getsize
+    results = []
+
+    reference = None
+    for engine in available_engines():
+        extractor = PDFTextExtractor(engine)
+        texts = {}
+
+        def extract(path):
+            texts[path] = extractor.extract_text(path, clean=True)
+
+        result = measure(f"extraction/{engine}", pdf_paths, extract,
+                         size_of=pdf_size, repeat=repeat, stage=engine, engine=engine, **info)
+        if engine == PDFPLUMBER:
+            reference = texts
+        elif reference is not None:
+            result.update(parity(reference, texts))
+        results.append(result)
+
+    cache_dir = tempfile.mkdtemp(prefix="juliuscv-bench-")
+    try:
+        cache = PDFTextCache(cache_dir)
+        info = dict(info, engine=cache.engine)
+        results.append(measure("extraction/text-cache-cold", pdf_paths,
+                               lambda path: cache.get_text(path, clean=True),
+                               size_of=pdf_size, stage="text-cache-cold", **info))
+        results.append(measure("extraction/text-cache-warm", pdf_paths,
+                               lambda path: cache.get_text(path, clean=True),
+                               size_of=pdf_size, repeat=repeat, stage="text-cache-warm", **info))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    return results
+
+
+def parity(reference: Dict[str, str], texts: Dict[str, str]) -> dict:
+    """
+        How close clean texts are to the reference ones: the share of
+        identical documents and the word-level F1 over all documents (words
+        compared as multisets, so line order does not matter)
+    """
+    identical = 0
+    common = reference_words = words = 0
+    for path, expected in reference.items():
+        actual = texts.get(path, "")
+        identical += actual == expected
+        expected_counts = Counter(expected.split())
+        actual_counts = Counter(actual.split())
+        common += sum((expected_counts & actual_counts).values())
+        reference_words += sum(expected_counts.values())
+        words += sum(actual_counts.values())
+
+    precision = common / words if words else 1.0
+    recall = common / reference_words if reference_words else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "parity_identical": round(identical / len(reference), 4) if reference else None,
+        "parity_word_f1": round(f1, 4),
+    }
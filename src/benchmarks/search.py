@@ -0,0 +1,55 @@
+import time
+from typing import List
+
+from benchmarks.common import latency, throughput
+
+DEFAULT_QUERIES = ["python", "sql, excel", "accounting, finance, budget, reporting, management"]
+DEFAULT_ALGORITHMS = ["KMP", "BM", "AC", "INDEX", "SA"]
+
+
+def run(queries: List[str] = None, algorithms: List[str] = None, top_n: int = 10,
+        repeat: int = 3, workers: int = None) -> List[dict]:
+    """
+        Benchmark CVSearchService.search end to end against the configured
+        database (DB_BACKEND). The first run of each query warms the caches
+        and is reported separately.
+    """
+    from db import get_paths
+    from search_engine import CVSearchService
+
+    queries = queries or DEFAULT_QUERIES
+    algorithms = algorithms or DEFAULT_ALGORITHMS
+    document_count = len(get_paths())
+
+    service = CVSearchService(workers=workers)
+    results = []
+    try:
+        for algorithm in algorithms:
+            for query in queries:
+                keyword_count = len([keyword for keyword in query.split(",") if keyword.strip()])
+                name = f"search/{algorithm.lower()}/kw={keyword_count}/top={top_n}"
+                info = {"suite": "search", "algorithm": algorithm, "query": query,
+                        "keywords": keyword_count, "top_n": top_n}
+
+                start = time.perf_counter()
+                service.search(query, algorithm, top_n)
+                first_run = time.perf_counter() - start
+
+                samples = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    service.search(query, algorithm, top_n)
+                    samples.append(time.perf_counter() - start)
+                samples.sort()
+
+                # docs/s counts the documents a search covers, not the ones it had to scan
+                result = {"name": name, **info, "docs": document_count, "repeat": repeat,
+                          "first_run_ms": round(first_run * 1000, 3), "seconds": round(sum(samples), 6)}
+                result.update(throughput(0, document_count * len(samples), sum(samples)))
+                result["mb_per_s"] = None
+                result.update(latency(samples))
+                results.append(result)
+    finally:
+        service.shutdown()
+
+    return results
@@ -1,51 +1,101 @@
-from string import printable
+from typing import Dict, Iterator, List
 
-def boyer_moore(text: str, pattern: str):
-    # start
-    p = len(pattern)
-    t = len(text)
-
-    if t < p:
-        return -1
-    last_occurrence = {}
-    
-    for i in range(len(printable)):
-        last_occurrence[printable[i]] = -1
-    
-    for i in range(len(pattern)):
-        last_occurrence[pattern[i]] = i
-        
-
-    i = p - 1
-    j = p - 1
-    while True:
-        while j >= 0 and i < t: 
-            if pattern[j] == text[i]:
-                if (j == 0):
-                    return i
-                else:
-                    j -= 1
-                    i -= 1
+
+class BoyerMooreMatcher:
+    """
+        Boyer-Moore matcher with the bad-character and (strong) good-suffix
+        rules. Both tables are built once per pattern, and the text is
+        scanned in place by offset without slicing.
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.last_occurrence = self._bad_character_table(pattern)
+        self.good_suffix = self._good_suffix_table(pattern)
+
+    @staticmethod
+    def _bad_character_table(pattern: str) -> Dict[str, int]:
+        # Characters missing from the table (any alphabet, not just ASCII) count as -1
+        last_occurrence = {}
+        for i, ch in enumerate(pattern):
+            last_occurrence[ch] = i
+        return last_occurrence
+
+    @staticmethod
+    def _good_suffix_table(pattern: str) -> List[int]:
+        # shift[j]: safe shift when the mismatch happens at pattern[j - 1];
+        # shift[0] is the shift after a full match
+        m = len(pattern)
+        shift = [0] * (m + 1)
+        border = [0] * (m + 1)
+
+        i = m
+        j = m + 1
+        border[i] = j
+        while i > 0:
+            while j <= m and pattern[i - 1] != pattern[j - 1]:
+                if shift[j] == 0:
+                    shift[j] = j - i
+                j = border[j]
+            i -= 1
+            j -= 1
+            border[i] = j
+
+        j = border[0]
+        for i in range(m + 1):
+            if shift[i] == 0:
+                shift[i] = j
+            if i == j:
+                j = border[j]
+
+        return shift
+
+    def finditer(self, text: str, start: int = 0, overlapping: bool = False) -> Iterator[int]:
+        """
+            Lazily yield the start index of every match. Without overlapping,
+            scanning resumes after the end of each match.
+        """
+        pattern = self.pattern
+        m = len(pattern)
+        n = len(text)
+        if m == 0:
+            return
+
+        last_occurrence = self.last_occurrence
+        good_suffix = self.good_suffix
+
+        s = start
+        while s <= n - m:
+            j = m - 1
+            while j >= 0 and pattern[j] == text[s + j]:
+                j -= 1
+
+            if j < 0:
+                yield s
+                s += good_suffix[0] if overlapping else m
             else:
-                i += p - min(last_occurrence.get(text[i], -1) + 1, j)
-                j = p - 1
-        return -1
-    
+                bad_character = j - last_occurrence.get(text[s + j], -1)
+                s += max(good_suffix[j + 1], bad_character)
+
+    def find(self, text: str, start: int = 0) -> int:
+        """
+            Index of the first match at or after start, or -1
+        """
+        return next(self.finditer(text, start), -1)
+
+    def count(self, text: str, overlapping: bool = False) -> int:
+        """
+            Number of matches, without building a list of positions
+        """
+        return sum(1 for _ in self.finditer(text, overlapping=overlapping))
+
+
+def boyer_moore(text: str, pattern: str):
+    return BoyerMooreMatcher(pattern).find(text)
+
 def boyer_moore_search(text: str, pattern:str):
-    i = 0
-    last = 0
-    result = []
-
-    while i < len(text) - len(pattern):
-        temp = (boyer_moore(text[i:], pattern))
-        if temp == -1:
-            break
-        else:
-            last = i
-            result.append(temp + last)
-            i = temp + len(pattern) + last
-
-    return result
+    # Start indices of all non-overlapping matches
+    return list(BoyerMooreMatcher(pattern).finditer(text))
 
 if __name__ == "__main__":
     text =  "saya suka python python dan pyrthonpythonp"
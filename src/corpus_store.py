@@ -0,0 +1,307 @@
+import os
+import sys
+import mmap
+import json
+import time
+import struct
+import argparse
+import threading
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Tuple
+
+DEFAULT_CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "corpus.bin")
+CORPUS_MAGIC = b"JCVCORP\x00"
+CORPUS_VERSION = 1
+
+# Written between documents. Clean text never contains NUL, so exact matches
+# cannot span two documents, and a run longer than the fuzzy max_distance
+# keeps approximate matches from doing so either.
+SEPARATOR = "\x00" * 4
+
+# Text is stored in the narrowest fixed width that holds every character, in
+# native byte order: width -> (encoding, memoryview format)
+_ORDER = "le" if sys.byteorder == "little" else "be"
+_WIDTHS = {1: ("latin-1", "B"), 2: (f"utf-16-{_ORDER}", "H"), 4: (f"utf-32-{_ORDER}", "I")}
+
+# magic, version, document count, separator length, character width, doc-id table size
+_HEADER = struct.Struct("<8sIIIIQ")
+
+
+class CorpusStore:
+    """
+        Read-only, memory-mapped view of every clean CV text.
+
+        corpus_file is either a corpus file or the pointer that write_corpus
+        keeps to the current version of one (see current_corpus_file).
+
+        File layout:
+            header | offsets (int64, documents + 1) | doc-id table (JSON) | blob
+
+        The blob is the text of every document, each followed by the
+        separator, with every character stored in the same number of bytes.
+        Positions and offsets count characters: offsets[i] is where document
+        i starts and offsets[-1] is the blob length. The matchers scan the
+        whole blob as one buffer of code points (with patterns from
+        code_points) and every hit position is mapped back to its document by
+        binary search on the offsets.
+
+        A store shared between threads is reference counted: every user
+        takes it with acquire and gives it back with release, and a retired
+        store is closed once the last user released it.
+    """
+
+    def __init__(self, corpus_file: str = DEFAULT_CORPUS_FILE):
+        self.corpus_file = current_corpus_file(corpus_file)
+        self._users = 0
+        self._retired = False
+        self._users_lock = threading.Lock()
+        self._mmap = None
+        self._file = open(self.corpus_file, "rb")
+        try:
+            # Identifies this version of the file, e.g. for indexes built over it
+            self.mtime = os.fstat(self._file.fileno()).st_mtime_ns
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        try:
+            magic, version, count, separator_length, width, table_size = _HEADER.unpack_from(self._mmap, 0)
+            if magic != CORPUS_MAGIC or version != CORPUS_VERSION or width not in _WIDTHS:
+                raise ValueError(f"Not a corpus file (version {CORPUS_VERSION}): {self.corpus_file}")
+
+            position = _HEADER.size
+            self.offsets = array("q")
+            self.offsets.frombytes(self._mmap[position:position + 8 * (count + 1)])
+            position += 8 * (count + 1)
+            self.doc_ids: List[str] = json.loads(self._mmap[position:position + table_size].decode("utf-8"))
+            position += table_size
+        except Exception:
+            self.close()
+            raise
+
+        self.separator_length = separator_length
+        self.width = width
+        self.encoding, typecode = _WIDTHS[width]
+        self.doc_numbers: Dict[str, int] = {doc_id: i for i, doc_id in enumerate(self.doc_ids)}
+        # Indexing the cast view gives code points, compared to the pattern's without copying
+        self.buffer = memoryview(self._mmap)[position:position + width * self.offsets[-1]].cast(typecode)
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def __enter__(self) -> "CorpusStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    @property
+    def size(self) -> int:
+        """Blob length in characters"""
+        return self.offsets[-1]
+
+    def document_at(self, position: int) -> int:
+        """Number of the document containing a blob position, or -1 inside a separator"""
+        doc = bisect_right(self.offsets, position) - 1
+        if doc < 0 or position >= self.offsets[doc + 1] - self.separator_length:
+            return -1
+        return doc
+
+    def text(self, doc_id: str) -> str:
+        doc = self.doc_numbers[doc_id]
+        return self.buffer[self.offsets[doc]:self.offsets[doc + 1] - self.separator_length].tobytes().decode(self.encoding)
+
+    def count(self, matcher) -> Dict[str, int]:
+        """
+            Scan the whole corpus once with a KMP, BM or FUZZY matcher compiled
+            from code_points(keyword) and count its hits per document, the way
+            matcher.count would count them in each document's text
+        """
+        if getattr(matcher, "max_distance", 0) >= self.separator_length:
+            raise ValueError(f"max_distance must be below the separator length ({self.separator_length})")
+
+        counts = [0] * len(self.doc_ids)
+        document_at = self.document_at
+        for position in matcher.finditer(self.buffer):
+            doc = document_at(position)
+            if doc >= 0:
+                counts[doc] += 1
+        return {self.doc_ids[doc]: n for doc, n in enumerate(counts) if n}
+
+    def count_all(self, automaton) -> Dict[Tuple[int, ...], Dict[str, int]]:
+        """
+            Scan the whole corpus once with an Aho-Corasick automaton built from
+            code_points patterns and count the hits of every pattern per document
+        """
+        counts: Dict[Tuple[int, ...], Dict[str, int]] = {pattern: {} for pattern in automaton.terminals}
+        document_at = self.document_at
+        doc_ids = self.doc_ids
+        for position, pattern in automaton.finditer(self.buffer):
+            doc = document_at(position)
+            if doc >= 0:
+                pattern_counts = counts[pattern]
+                doc_id = doc_ids[doc]
+                pattern_counts[doc_id] = pattern_counts.get(doc_id, 0) + 1
+        return counts
+
+    def acquire(self) -> "CorpusStore":
+        """Take the store for one search; pair with release"""
+        with self._users_lock:
+            if self._retired and self._users == 0:
+                raise ValueError(f"Corpus store was closed: {self.corpus_file}")
+            self._users += 1
+        return self
+
+    def release(self):
+        with self._users_lock:
+            self._users -= 1
+            close = self._retired and self._users == 0
+        if close:
+            self.close()
+
+    def retire(self):
+        """Close the store as soon as no search holds it anymore (e.g. a newer version was opened)"""
+        with self._users_lock:
+            self._retired = True
+            close = self._users == 0
+        if close:
+            self.close()
+
+    def close(self):
+        buffer = getattr(self, "buffer", None)
+        if buffer is not None:
+            buffer.release()
+            self.buffer = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+
+def code_points(keyword: str) -> Tuple[int, ...]:
+    """A keyword as the pattern the corpus buffer is searched with"""
+    return tuple(map(ord, keyword))
+
+
+def current_corpus_file(corpus_file: str) -> str:
+    """
+        The corpus file that corpus_file stands for: corpus_file itself when
+        it holds a corpus, else the version its pointer names
+    """
+    with open(corpus_file, "rb") as f:
+        head = f.read(len(CORPUS_MAGIC))
+        if head == CORPUS_MAGIC:
+            return corpus_file
+        name = (head + f.read()).decode("utf-8").strip()
+    return os.path.join(os.path.dirname(os.path.abspath(corpus_file)), name)
+
+
+def _corpus_versions(corpus_file: str) -> List[str]:
+    # Files written for corpus_file, e.g. corpus.1729000000000000000.bin for corpus.bin
+    directory = os.path.dirname(os.path.abspath(corpus_file))
+    stem, ext = os.path.splitext(os.path.basename(corpus_file))
+    return [os.path.join(directory, name) for name in os.listdir(directory)
+            if name.startswith(f"{stem}.") and name.endswith(ext) and name[len(stem) + 1:len(name) - len(ext)].isdigit()]
+
+
+def write_corpus(documents: Iterable[Tuple[str, str]], corpus_file: str = DEFAULT_CORPUS_FILE) -> int:
+    """
+        Write (doc id, clean text) documents to a corpus; the first text of a
+        repeated doc id wins.
+
+        The corpus goes to a new versioned file next to corpus_file, and
+        corpus_file becomes a small pointer to it, replaced atomically. A
+        version that is still memory-mapped is never overwritten (Windows
+        does not allow that), and older versions are deleted once they can
+        be; those still open elsewhere are deleted by a later write.
+
+        Returns:
+            Number of documents written
+    """
+    doc_ids = []
+    texts = []
+    seen = set()
+    highest = 0
+    for doc_id, clean_text in documents:
+        if doc_id in seen:
+            continue
+        seen.add(doc_id)
+        doc_ids.append(doc_id)
+        texts.append(clean_text + SEPARATOR)
+        if clean_text and not clean_text.isascii():
+            highest = max(highest, ord(max(clean_text)))
+
+    width = 1 if highest < 0x100 else 2 if highest < 0x10000 else 4
+    encoding = _WIDTHS[width][0]
+
+    offsets = array("q", [0])
+    for text in texts:
+        offsets.append(offsets[-1] + len(text))
+    table = json.dumps(doc_ids).encode("utf-8")
+
+    os.makedirs(os.path.dirname(os.path.abspath(corpus_file)), exist_ok=True)
+    stem, ext = os.path.splitext(corpus_file)
+    version_file = f"{stem}.{time.time_ns()}{ext}"
+    with open(version_file, "wb") as f:
+        f.write(_HEADER.pack(CORPUS_MAGIC, CORPUS_VERSION, len(doc_ids), len(SEPARATOR), width, len(table)))
+        f.write(offsets.tobytes())
+        f.write(table)
+        for text in texts:
+            f.write(text.encode(encoding))
+
+    # The pointer is only ever read and closed, so replacing it is safe while versions are mapped
+    tmp_file = f"{corpus_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        f.write(os.path.basename(version_file))
+    os.replace(tmp_file, corpus_file)
+
+    for old_file in _corpus_versions(corpus_file):
+        if os.path.abspath(old_file) != os.path.abspath(version_file):
+            try:
+                os.remove(old_file)
+            except OSError:
+                pass
+    return len(doc_ids)
+
+
+def build_corpus(cv_paths: Iterable[str], text_cache, corpus_file: str = DEFAULT_CORPUS_FILE,
+                 base_dir: str = "..") -> int:
+    """
+        Write the corpus file from the clean text of every existing CV.
+
+        cv_paths are database paths (data/<CATEGORY>/<id>.pdf), resolved
+        against base_dir when reading the PDF.
+    """
+    def documents():
+        for cv_path in cv_paths:
+            pdf_path = os.path.join(base_dir, cv_path)
+            if os.path.isfile(pdf_path):
+                yield cv_path, text_cache.get_text(pdf_path, clean=True)
+
+    count = write_corpus(documents(), corpus_file)
+    text_cache.flush()
+    return count
+
+
+def main():
+    """Build the corpus file for every CV registered in the database"""
+    parser = argparse.ArgumentParser(description='Build the memory-mapped corpus of all CV texts in the database')
+    parser.add_argument('-o', '--output', default=DEFAULT_CORPUS_FILE, help='Corpus file to write')
+    parser.add_argument('--base-dir', default='..', help='Directory the database cv_path values are relative to')
+    args = parser.parse_args()
+
+    from db import get_paths
+    from text_cache import PDFTextCache
+
+    cv_paths = [row["cv_path"] for row in get_paths()]
+    count = build_corpus(cv_paths, PDFTextCache(), args.output, args.base_dir)
+
+    print(f"Stored {count} documents, {os.path.getsize(current_corpus_file(args.output)) / 1e6:.2f} MB")
+    print(f"Corpus saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import threading
+from typing import Dict, List, Optional
+
+from integrated_regex import IntegratedCVProcessor
+from db import get_applicant_profiles, get_paths, get_query_stats, log_query_stats
+from pdf_engines import get_engine
+from search_engine import CVSearchService, local_cv_path
+from summary_cache import CVSummaryCache
+from tracing import get_recent_traces
+
+
+class CVBackend:
+    """
+        Search and CV summary logic shared by the GUI (gui.Backend) and the
+        headless server (server.py); nothing here imports PyQt.
+
+        One instance keeps the search service (text cache, indexes, worker
+        pool), the summary cache and the applicant profiles warm for as long
+        as it lives, and may be used from several threads at once.
+    """
+
+    def __init__(self, workers: int = None):
+        self.service = CVSearchService(workers)
+        self.text_cache = self.service.text_cache
+        self.processor = IntegratedCVProcessor(self.text_cache)
+        self.summaries = CVSummaryCache(self.processor)
+
+        # Applicant profiles by database cv_path, filled one result page at a time
+        self._profiles = {}
+        self._profiles_lock = threading.Lock()
+
+    def warm_up(self):
+        """
+            Do the slow parts of the first search and summary ahead of time:
+            connect to the database and import both PDF engines
+        """
+        get_paths()
+        for engine in {self.text_cache.engine, self.processor.pdf_extractor.engine}:
+            get_engine(engine).load()
+
+    def search(self, keywords: str, algorithm: str, top_n: int, **kwargs) -> List[dict]:
+        """
+            CVSearchService.search (same keyword arguments), also loading the
+            profiles of the results so summaries skip the database
+        """
+        results = self.service.search(keywords, algorithm, top_n, **kwargs)
+        self.prefetch_profiles(results)
+        return results
+
+    def prefetch_profiles(self, results: List[dict]):
+        """Load the profiles of a result page in one query so Summary clicks skip the database"""
+        self.get_profiles([result["cv_path"] for result in results])
+
+    def get_profiles(self, local_paths: List[str]) -> Dict[str, Optional[dict]]:
+        # local_paths are cv_path values as the results carry them (see local_cv_path)
+        prefix_length = len(local_cv_path(""))
+        paths = [path[prefix_length:] for path in local_paths]
+
+        with self._profiles_lock:
+            missing = [path for path in paths if path not in self._profiles]
+        if missing:
+            fetched = get_applicant_profiles(missing)
+            with self._profiles_lock:
+                self._profiles.update(fetched)
+
+        with self._profiles_lock:
+            return {local_path: self._profiles.get(path) for local_path, path in zip(local_paths, paths)}
+
+    def get_cv_summary(self, cv_path: str) -> dict:
+        """
+            Applicant profile and extracted CV sections of a search result's
+            cv_path. Raises LookupError when no applicant has that CV and
+            FileNotFoundError when the PDF is missing.
+        """
+        profile = self.get_profiles([cv_path])[cv_path]
+        if profile is None:
+            raise LookupError(f"No applicant found for {cv_path}")
+        cv_info = self.summaries.get(cv_path)
+
+        dob = profile.get("date_of_birth")
+
+        return {
+            "name": f"{profile['first_name']} {profile['last_name']}",
+            "birthdate": dob.strftime("%Y-%m-%d") if dob else "-",
+            "address": profile.get("address", "-"),
+            "phone": profile.get("phone_number", "-"),
+            "skills": getattr(cv_info, "skills", []),
+            "education": getattr(cv_info, "education", []),
+            "job_history": getattr(cv_info, "job_history", [])
+        }
+
+    def get_db_stats(self) -> Dict[str, dict]:
+        """Latency of database calls made so far, per query"""
+        return get_query_stats()
+
+    def get_search_traces(self, limit: int = None) -> List[dict]:
+        """Per-stage timings of the most recent searches, oldest first"""
+        return get_recent_traces(limit or None)
+
+    def shutdown(self):
+        self.service.shutdown()
+        log_query_stats()
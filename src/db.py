@@ -1,57 +1,95 @@
-import mysql.connector
-import os
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
 from dotenv import load_dotenv
 
+from storage import get_storage
+from tracing import add_stage
+
 load_dotenv()
 
-def get_db_connection():
-    db = mysql.connector.connect(
-        host=os.getenv("DB_HOST"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD")
-    )
+logger = logging.getLogger(__name__)
 
-    return db
+@contextmanager
+def db_cursor(name, dictionary=True):
+    # Borrow a connection and cursor from the configured backend; the call is timed on exit
+    start = time.perf_counter()
+    storage = get_storage()
+    try:
+        with storage.connection() as connection:
+            cursor = storage.cursor(connection, dictionary=dictionary)
+            try:
+                yield connection, cursor
+            finally:
+                cursor.close()
+    finally:
+        elapsed = time.perf_counter() - start
+        record_latency(name, elapsed)
+        add_stage("db_fetch", elapsed)
 
-def create_db() :
-        # Initialize database connection
-    db_connection = get_db_connection()
-    cursor = db_connection.cursor()
 
-    # Create database if it doesn't exist
-    cursor.execute("CREATE DATABASE IF NOT EXISTS Tubes3Stima")
-    print("Database Tubes3Stima created successfully")
+# Per-call latency samples (seconds), the most recent ones per query name
+_LATENCY_SAMPLES = 1000
+_latencies = {}
+_latency_lock = threading.Lock()
+
+def record_latency(name, seconds):
+    with _latency_lock:
+        _latencies.setdefault(name, deque(maxlen=_LATENCY_SAMPLES)).append(seconds)
+
+def get_query_stats():
+    # return dict(name, dict(count, mean_ms, p50_ms, p95_ms, max_ms)) over the recent samples
+    with _latency_lock:
+        samples = {name: sorted(values) for name, values in _latencies.items()}
+
+    stats = {}
+    for name, values in samples.items():
+        count = len(values)
+        stats[name] = {
+            "count": count,
+            "mean_ms": round(sum(values) / count * 1000, 3),
+            "p50_ms": round(values[int(0.50 * (count - 1))] * 1000, 3),
+            "p95_ms": round(values[int(0.95 * (count - 1))] * 1000, 3),
+            "max_ms": round(values[-1] * 1000, 3),
+        }
+    return stats
 
-    # Select the database
-    cursor.execute(f"USE {os.getenv('DB_NAME')}")
-    print("Using database Tubes3Stima")
+def format_query_stats():
+    return [f"{name}: {stat['count']} calls, mean {stat['mean_ms']} ms, "
+            f"p50 {stat['p50_ms']} ms, p95 {stat['p95_ms']} ms, max {stat['max_ms']} ms"
+            for name, stat in sorted(get_query_stats().items())]
 
+def print_query_stats():
+    for line in format_query_stats():
+        print(line)
+
+def log_query_stats(level=logging.INFO):
+    if logger.isEnabledFor(level):
+        for line in format_query_stats():
+            logger.log(level, line)
+
+def create_db() :
+    # Create the tables and seed data on the configured backend (DB_BACKEND)
+    storage = get_storage()
+    with storage.admin_connection() as db_connection:
+        _create_tables(storage, db_connection)
+    print("Tables created successfully")
+
+def _create_tables(storage, db_connection):
+    cursor = db_connection.cursor()
+    print(f"Using {storage.name} database")
+
+    cursor.execute("DROP TABLE IF EXISTS ApplicationText;")
     cursor.execute("DROP TABLE IF EXISTS ApplicationDetail;")
     cursor.execute("DROP TABLE IF EXISTS ApplicantProfile;")
 
-    # Create ApplicantProfile table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS ApplicantProfile (
-            applicant_id INT AUTO_INCREMENT PRIMARY KEY,
-            first_name VARCHAR(50),
-            last_name VARCHAR(50),
-            date_of_birth DATE,
-            address VARCHAR(255),
-            phone_number VARCHAR(20)
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-    """)
-
-    # Create ApplicationDetail table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS ApplicationDetail (
-            detail_id INT AUTO_INCREMENT PRIMARY KEY,
-            applicant_id INT NOT NULL,
-            application_role VARCHAR(100),
-            cv_path TEXT,
-            FOREIGN KEY (applicant_id) REFERENCES ApplicantProfile(applicant_id)
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-    """)
-    
+    # Create ApplicantProfile and ApplicationDetail tables, and ApplicationText for ingest.py
+    for statement in storage.schema:
+        cursor.execute(statement)
+    cursor.execute(storage.text_table_sql)
+
     cursor.execute("""
                     INSERT INTO ApplicantProfile (applicant_id, first_name, last_name, date_of_birth, address, phone_number) VALUES
                     (1, 'Moh4mm4d', 'Nu9r4h4', '2003-06-14', 'Jl. Kenanga No. 12, Jakarta', '081234567891'),
@@ -743,41 +781,140 @@ def create_db() :
                     (599, 20, 'Inside Sales Representative', 'data/SALES/13812481.pdf'),
                     (600, 58, 'Agricultural Engineer', 'data/AGRICULTURE/10953078.pdf');
                     """)
-    print("Tables created successfully")
 
     db_connection.commit()
-
-    db_connection.close()
+    cursor.close()
 
 def get_paths():
     # return dict("id", path)
 
-    db_connection = get_db_connection()
-    cursor = db_connection.cursor(dictionary=True)
+    with db_cursor("get_paths") as (_, cursor):
+        cursor.execute("""
+                        SELECT ad.applicant_id,  ap.first_name, ap.last_name, ad.cv_path, ad.detail_id FROM applicationdetail as ad JOIN applicantprofile as ap on ad.applicant_id = ap.applicant_id;                 
+                        """)
+        
+        res = cursor.fetchall()
 
+    return res
 
-    cursor.execute(f"USE {os.getenv('DB_NAME')}")
+def get_applicant_profile_by_id(path):
+    logger.debug("Profile lookup: %s", path)
 
-    cursor.execute("""
-                    SELECT ad.applicant_id,  ap.first_name, ap.last_name, ad.cv_path, ad.detail_id FROM applicationdetail as ad JOIN applicantprofile as ap on ad.applicant_id = ap.applicant_id;                 
-                    """)
-    
-    res = cursor.fetchall()
+    with db_cursor("get_applicant_profile_by_id") as (_, cursor):
+        cursor.execute(f"""
+            SELECT ap.first_name, ap.last_name, ap.date_of_birth, ap.address, ap.phone_number, ad.cv_path
+            FROM applicantprofile AS ap
+            JOIN applicationdetail AS ad ON ap.applicant_id = ad.applicant_id
+            WHERE ad.cv_path = {get_storage().param}
+        """, (path,))
+
+        res = cursor.fetchone()
 
     return res
 
-def get_applicant_profile_by_id(path):
-    print("Path: ", path)
-    db = get_db_connection()
-    cursor = db.cursor(dictionary=True)
+def get_applicant_profiles(keys, batch_size=500):
+    # keys: cv_path strings or applicant_id ints; return dict(key, profile) in one query per batch_size keys
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
 
-    cursor.execute(f"USE {os.getenv('DB_NAME')}")
+    by_id = isinstance(keys[0], int)
+    column = "ap.applicant_id" if by_id else "ad.cv_path"
+    param = get_storage().param
+
+    profiles = {}
+    with db_cursor("get_applicant_profiles") as (_, cursor):
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start:start + batch_size]
+            placeholders = ", ".join([param] * len(batch))
+            if by_id:
+                cursor.execute(f"""
+                    SELECT ap.applicant_id, ap.first_name, ap.last_name, ap.date_of_birth, ap.address, ap.phone_number
+                    FROM applicantprofile AS ap
+                    WHERE {column} IN ({placeholders})
+                """, batch)
+            else:
+                cursor.execute(f"""
+                    SELECT ap.applicant_id, ap.first_name, ap.last_name, ap.date_of_birth, ap.address, ap.phone_number, ad.cv_path
+                    FROM applicantprofile AS ap
+                    JOIN applicationdetail AS ad ON ap.applicant_id = ad.applicant_id
+                    WHERE {column} IN ({placeholders})
+                """, batch)
+
+            for row in cursor.fetchall():
+                # Like get_applicant_profile_by_id, the first row of a duplicated cv_path wins
+                profiles.setdefault(row["applicant_id"] if by_id else row["cv_path"], row)
+
+    return profiles
+
+
+def create_text_table():
+    # Run by ingest.py and reindex.py before they write ApplicationText (read paths never create it)
+    with db_cursor("create_text_table", dictionary=False) as (db, cursor):
+        cursor.execute(get_storage().text_table_sql)
+        db.commit()
+
+def save_cv_texts(rows, batch_size=100, commit_every=5):
+    # rows: iterable of (detail_id, raw_text, clean_text), consumed lazily
+    storage = get_storage()
+    query = storage.upsert_text_sql
+
+    saved = 0
+    with db_cursor("save_cv_texts", dictionary=False) as (db, cursor):
+        batches = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) < batch_size:
+                continue
+
+            cursor.executemany(query, batch)
+            saved += len(batch)
+            batch = []
+            batches += 1
+            if batches % commit_every == 0:
+                db.commit()
+
+        if batch:
+            cursor.executemany(query, batch)
+            saved += len(batch)
+
+        db.commit()
+
+    return saved
+
+def delete_cv_texts(detail_ids):
+    # Remove the stored text of these applications; return the number of rows deleted
+    detail_ids = list(detail_ids)
+    if not detail_ids:
+        return 0
+
+    storage = get_storage()
+    deleted = 0
+    with db_cursor("delete_cv_texts", dictionary=False) as (db, cursor):
+        for start in range(0, len(detail_ids), 500):
+            batch = detail_ids[start:start + 500]
+            placeholders = ", ".join([storage.param] * len(batch))
+            cursor.execute(f"DELETE FROM ApplicationText WHERE detail_id IN ({placeholders})", batch)
+            deleted += cursor.rowcount
+        db.commit()
+
+    return deleted
+
+def get_cv_texts():
+    # return dict(detail_id, clean_text); empty (searches then read the PDFs) until ingest.py has run
+    storage = get_storage()
+    with db_cursor("get_cv_texts", dictionary=False) as (_, cursor):
+        cursor.execute(storage.table_exists_sql, ("ApplicationText",))
+        if not cursor.fetchone()[0]:
+            logger.warning("ApplicationText table not found; run ingest.py first (reading CV text from the PDFs)")
+            return {}
+        cursor.execute("SELECT detail_id, clean_text FROM ApplicationText;")
+
+        res = dict(cursor.fetchall())
+
+    return res
 
-    cursor.execute("""
-        SELECT ap.first_name, ap.last_name, ap.date_of_birth, ap.address, ap.phone_number, ad.cv_path
-        FROM applicantprofile AS ap
-        JOIN applicationdetail AS ad ON ap.applicant_id = ad.applicant_id
-        WHERE ad.cv_path = %s
-    """, (path,))
 
-    return cursor.fetchone()
+if __name__ == "__main__":
+    create_db()
@@ -1,21 +1,21 @@
 import sys
 import os
+import logging
+import threading
 from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget
 from PyQt5.QtCore import QVariant
 
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtWebChannel import QWebChannel
-from PyQt5.QtCore import QUrl, QObject, pyqtSlot, pyqtSignal, QTimer
+from PyQt5.QtCore import QUrl, QObject, QThread, pyqtSlot, pyqtSignal, QTimer
 from PyQt5.QtGui import QDesktopServices
-from pdf_extractor import PDFTextExtractor, extract_pdf_to_string
-from integrated_regex import IntegratedCVProcessor, CVInfo
-
-# import mysql.connector
-# Import your KMP and BM implementations
-from kmp import kmp_search
-from boyer_moore import boyer_moore_search
-from db import get_paths, get_applicant_profile_by_id
-from LevenshteinDistance import fuzzy_search
+
+# The search backend (cv_backend and everything it imports) is only imported
+# by Backend's warm-up thread, so the window can appear before it is loaded
+import startup
+from tracing import setup_logging
+
+logger = logging.getLogger(__name__)
         
 class JuliusCVApp(QMainWindow):
     def __init__(self):
@@ -30,6 +30,7 @@ class JuliusCVApp(QMainWindow):
         self.channel.registerObject("backend", self.backend)
         self.browser.page().setWebChannel(self.channel)
 
+        self.browser.loadFinished.connect(lambda ok: startup.mark("page loaded"))
         self.load_html_content()
 
         central_widget = QWidget()
@@ -37,6 +38,10 @@ class JuliusCVApp(QMainWindow):
         layout = QVBoxLayout(central_widget)
         layout.addWidget(self.browser)
 
+    def closeEvent(self, event):
+        self.backend.shutdown()
+        super().closeEvent(event)
+
     def load_html_content(self):
         try:
             html_file_path = os.path.abspath("gui.html")
@@ -45,77 +50,168 @@ class JuliusCVApp(QMainWindow):
             base_url = QUrl.fromLocalFile(html_file_path)
             self.browser.setHtml(html_content, base_url)
         except FileNotFoundError:
-            print("Error: gui.html not found.")
+            logger.error("gui.html not found")
+
+
+class SearchWorker(QThread):
+    """Runs one search off the GUI thread and reports back through signals"""
+
+    progress = pyqtSignal(int, int, int)
+    partial = pyqtSignal(int, list)
+    finished_search = pyqtSignal(int, list)
+    cancelled = pyqtSignal(int)
+    failed = pyqtSignal(int, str)
+
+    def __init__(self, get_core, query_id, keywords, algorithm, top_n):
+        super().__init__()
+        # Called in the worker thread, which waits there for the backend warm-up
+        self.get_core = get_core
+        self.query_id = query_id
+        self.keywords = keywords
+        self.algorithm = algorithm
+        self.top_n = top_n
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        try:
+            core = self.get_core()
+        except Exception as e:
+            self.failed.emit(self.query_id, str(e))
+            return
+        # Imported by the warm-up already; importing it here keeps it off the startup path
+        from search_engine import SearchCancelled
+
+        try:
+            results = core.service.search(
+                self.keywords, self.algorithm, self.top_n,
+                on_progress=lambda done, total: self.progress.emit(self.query_id, done, total),
+                on_partial=lambda results: self.partial.emit(self.query_id, results),
+                cancel_event=self.cancel_event,
+            )
+            core.prefetch_profiles(results)
+            self.finished_search.emit(self.query_id, results)
+        except SearchCancelled:
+            self.cancelled.emit(self.query_id)
+        except Exception as e:
+            self.failed.emit(self.query_id, str(e))
+
+    def cancel(self):
+        self.cancel_event.set()
 
 
 class Backend(QObject):
+    # Streamed to the page through QWebChannel; the first argument is the query id
+    searchProgress = pyqtSignal(int, int, int)
+    searchPartial = pyqtSignal(int, list)
+    searchFinished = pyqtSignal(int, list)
+    searchCancelled = pyqtSignal(int)
+    searchFailed = pyqtSignal(int, str)
+
     def __init__(self):
         super().__init__()
-        self.processor = IntegratedCVProcessor()
+        # The search and summary logic lives in cv_backend, shared with server.py.
+        # It is created in the background; the core property waits for it.
+        self._core = None
+        self._core_error = None
+        self._core_ready = threading.Event()
+        threading.Thread(target=self._warm_up, name="backend-warm-up", daemon=True).start()
+
+        self._query_id = 0
+        self._current_worker = None
+        # Cancelled workers may still be finishing a batch; keep them alive until they stop
+        self._workers = set()
         
+    def _warm_up(self):
+        try:
+            with startup.timed("import cv_backend"):
+                from cv_backend import CVBackend
+            with startup.timed("create CVBackend"):
+                core = CVBackend()
+        except Exception as e:
+            logger.exception("Backend failed to start")
+            self._core_error = e
+            self._core_ready.set()
+            return
+
+        self._core = core
+        self._core_ready.set()
+        try:
+            with startup.timed("warm up database and PDF engines"):
+                core.warm_up()
+        except Exception:
+            # The first search reports the problem again, with the page open
+            logger.warning("Backend warm-up failed", exc_info=True)
+        startup.mark("backend ready")
+
+    @property
+    def core(self):
+        """The CVBackend, waiting for the warm-up thread to create it"""
+        self._core_ready.wait()
+        if self._core is None:
+            raise RuntimeError(f"Backend failed to start: {self._core_error}")
+        return self._core
+
+    @property
+    def service(self):
+        return self.core.service
+
     @pyqtSlot(str, str, int, result=list)
     def searchCVs(self, keywords: str, algorithm: str, top_n: int):        
-        def match(text, keyword):
-            if algorithm.upper() == "KMP":
-                count =  kmp_search(keyword, text)
-            elif algorithm.upper() == "BM":
-                count = len(boyer_moore_search(text, keyword))
-            else:
-                count = 0
-
-            if count > 0:
-                return count, False
-            
-            return fuzzy_search(text, keyword), True
-
-        rows = get_paths()
-        print(rows[0])
-
-        results = []
-
-        for row in rows:
-            fuzzy_used = False
-            applicant_id = row["applicant_id"]
-            first_name = row["first_name"]
-            last_name = row["last_name"]
-            cv_path = row["cv_path"]
-            cv_path_dotdot = "..\\" + cv_path
-            print(cv_path_dotdot)
-            if not os.path.isfile(cv_path_dotdot):
-                print("cont")
-                continue
-            
-            with open(cv_path_dotdot, "r", encoding="utf-8", errors="ignore") as file:
-                print(cv_path_dotdot)
-                content = extract_pdf_to_string(cv_path_dotdot, True)
-
-            keyword_list = [kw.strip().lower() for kw in keywords.split(",")]
-            keyword_matches = []
-            total_matches = 0
-
-            for keyword in keyword_list:
-                count, fuzzy = match(content, keyword)
-                if fuzzy:
-                    fuzzy_used = True
-                if count > 0:
-                    keyword_matches.append({"keyword": keyword, "count": count})
-                    total_matches += count
-
-            if total_matches > 0:
-                print("Name: ", first_name, last_name)
-                print("Matches: ", total_matches)
-                results.append({
-                    "applicant_id" : applicant_id,
-                    "name": f"{first_name} {last_name}",
-                    "matches": total_matches,
-                    "keywords": keyword_matches,
-                    "cv_path" : f"{cv_path_dotdot}",
-                    "fuzzy" : fuzzy_used
-                })
-
-        sorted_results = sorted(results, key=lambda x: -x["matches"])[:top_n]
-        return sorted_results
-    
+        return self.service.search(keywords, algorithm, top_n)
+
+    @pyqtSlot(str, str, int, result=int)
+    def startSearch(self, keywords: str, algorithm: str, top_n: int):
+        """Start an asynchronous search, cancelling the running one, and return its query id"""
+        self.cancelSearch()
+
+        self._query_id += 1
+        worker = SearchWorker(lambda: self.core, self._query_id, keywords, algorithm, top_n)
+        worker.progress.connect(self.searchProgress)
+        worker.partial.connect(self.searchPartial)
+        worker.finished_search.connect(self.searchFinished)
+        worker.cancelled.connect(self.searchCancelled)
+        worker.failed.connect(self.searchFailed)
+        worker.finished.connect(lambda: self._release_worker(worker))
+
+        self._workers.add(worker)
+        self._current_worker = worker
+        worker.start()
+        return self._query_id
+
+    @pyqtSlot()
+    def cancelSearch(self):
+        if self._current_worker is not None:
+            self._current_worker.cancel()
+            self._current_worker = None
+
+    def _release_worker(self, worker):
+        self._workers.discard(worker)
+        if self._current_worker is worker:
+            self._current_worker = None
+        worker.deleteLater()
+
+    def shutdown(self):
+        self.cancelSearch()
+        for worker in list(self._workers):
+            worker.wait()
+        self._core_ready.wait()
+        if self._core is not None:
+            self._core.shutdown()
+
+    @pyqtSlot(result='QVariant')
+    def getDbStats(self):
+        """Latency of database calls made so far, per query"""
+        if not self._core_ready.is_set() or self._core is None:
+            return {}
+        return self._core.get_db_stats()
+
+    @pyqtSlot(int, result='QVariant')
+    def getSearchTraces(self, limit):
+        """Per-stage timings of the most recent searches, oldest first"""
+        if not self._core_ready.is_set() or self._core is None:
+            return []
+        return self._core.get_search_traces(limit)
+
     @pyqtSlot(str)
     def openFile(self, path):
         QDesktopServices.openUrl(QUrl.fromLocalFile(path))
@@ -124,21 +220,7 @@ class Backend(QObject):
     @pyqtSlot(str, result='QVariant')
     def getCVSummary(self, cv_path):
         try:
-            profile = get_applicant_profile_by_id(cv_path[3:])
-            print("name: ", profile['first_name'])
-            cv_info = self.processor.process_pdf(cv_path)
-
-            dob = profile.get("date_of_birth")
-
-            return {
-                "name": f"{profile['first_name']} {profile['last_name']}",
-                "birthdate": dob.strftime("%Y-%m-%d") if dob else "-",
-                "address": profile.get("address", "-"),
-                "phone": profile.get("phone_number", "-"),
-                "skills": getattr(cv_info, "skills", []),
-                "education": getattr(cv_info, "education", []),
-                "job_history": getattr(cv_info, "job_history", [])
-            }
+            return self.core.get_cv_summary(cv_path)
         except Exception as e:
             return {"error": str(e)}
 
@@ -146,6 +228,7 @@ class Backend(QObject):
 
     
 if __name__ == "__main__":
+    setup_logging()
     app = QApplication(sys.argv)
     window = JuliusCVApp()
     window.show()
@@ -0,0 +1,113 @@
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+from text_cache import PDFTextCache
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+_worker_text_cache = None
+
+
+def _extract_chunk(pdf_paths: List[str]) -> List[Tuple[str, str]]:
+    # Runs inside a pool worker; extraction goes through the shared text cache
+    global _worker_text_cache
+    if _worker_text_cache is None:
+        _worker_text_cache = PDFTextCache()
+    texts = [_worker_text_cache.get_texts(pdf_path) for pdf_path in pdf_paths]
+    _worker_text_cache.flush()
+    return texts
+
+
+def find_pdfs(data_dir: str) -> Dict[str, str]:
+    """
+        Walk the data directory and map database-style cv_path values
+        (data/<CATEGORY>/<id>.pdf) to file paths
+    """
+    root = os.path.dirname(os.path.abspath(data_dir))
+    pdfs = {}
+    for dirpath, _, filenames in os.walk(data_dir):
+        for filename in filenames:
+            if not filename.lower().endswith('.pdf'):
+                continue
+            pdf_path = os.path.join(dirpath, filename)
+            cv_path = os.path.relpath(os.path.abspath(pdf_path), root).replace(os.sep, "/")
+            pdfs[cv_path] = pdf_path
+    return pdfs
+
+
+def extract_texts(jobs: List[Tuple[List[int], str]], workers: int, chunk_size: int = 16) -> Iterator[Tuple[int, str, str]]:
+    """
+        Extract raw and clean text for each (detail_ids, pdf_path) job in parallel,
+        yielding one (detail_id, raw_text, clean_text) row per detail id
+    """
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_extract_chunk, [[pdf_path for _, pdf_path in chunk] for chunk in chunks])
+        for chunk, texts in zip(chunks, results):
+            for (detail_ids, _), (raw_text, clean_text) in zip(chunk, texts):
+                for detail_id in detail_ids:
+                    yield detail_id, raw_text, clean_text
+
+
+def ingest(data_dir: str = DEFAULT_DATA_DIR, workers: int = None, batch_size: int = 100, commit_every: int = 5) -> int:
+    """
+        Extract every CV under data_dir that is registered in ApplicationDetail
+        and store its raw and clean text in ApplicationText
+
+        Returns:
+            Number of ApplicationText rows written
+    """
+    from db import create_text_table, get_paths, save_cv_texts
+
+    if not os.path.isdir(data_dir):
+        raise FileNotFoundError(f"Directory not found: {data_dir}")
+
+    pdfs = find_pdfs(data_dir)
+    print(f"Found {len(pdfs)} PDF files in {data_dir}")
+
+    # Several applications may point at the same CV file
+    detail_ids = {}
+    for row in get_paths():
+        detail_ids.setdefault(row["cv_path"], []).append(row["detail_id"])
+
+    jobs = [(detail_ids[cv_path], pdf_path) for cv_path, pdf_path in sorted(pdfs.items()) if cv_path in detail_ids]
+    missing = [cv_path for cv_path in detail_ids if cv_path not in pdfs]
+
+    print(f"CVs to ingest: {len(jobs)}")
+    print(f"Not in database: {len(pdfs) - len(jobs)}")
+    print(f"Missing on disk: {len(missing)}")
+
+    create_text_table()
+    start = time.perf_counter()
+    saved = save_cv_texts(extract_texts(jobs, workers), batch_size, commit_every)
+    elapsed = time.perf_counter() - start
+
+    print(f"Stored text for {saved} applications in {elapsed:.1f}s")
+    return saved
+
+
+def main():
+    """Main function with command line interface"""
+    parser = argparse.ArgumentParser(description='Extract CV text once and store it in the database')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='Directory containing the CV PDF files')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Extraction worker processes (default: all CPUs)')
+    parser.add_argument('--batch-size', type=int, default=100, help='Rows per executemany insert')
+    parser.add_argument('--commit-every', type=int, default=5, help='Commit after this many batches')
+
+    args = parser.parse_args()
+
+    try:
+        ingest(args.data_dir, args.workers, args.batch_size, args.commit_every)
+        return 0
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
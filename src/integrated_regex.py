@@ -2,22 +2,31 @@ import os
 import sys
 import argparse
 from pdf_extractor import PDFTextExtractor
+from pdf_engines import layout_engine
 from regex import CVRegexExtractor, CVInfo
 
 class IntegratedCVProcessor:
     """Integrated processor that handles PDF extraction and CV information extraction"""
     
-    def __init__(self):
-        self.pdf_extractor = PDFTextExtractor()
+    def __init__(self, text_cache=None):
+        # Section extraction needs line layout, so it may use another engine than matching
+        self.pdf_extractor = PDFTextExtractor(layout_engine())
         self.regex_extractor = CVRegexExtractor()
+        # Optional PDFTextCache; when set, raw text is read from it instead of the PDF,
+        # through a cache for this extractor's engine in the same directory
+        if text_cache is not None and text_cache.engine != self.pdf_extractor.engine:
+            text_cache = type(text_cache)(text_cache.cache_dir, self.pdf_extractor)
+        self.text_cache = text_cache
     
-    def process_pdf(self, pdf_path: str, output_dir: str = None) -> CVInfo:
+    def process_pdf(self, pdf_path: str, output_dir: str = None, save_files: bool = True) -> CVInfo:
         """
         Process a PDF file: extract text, then extract CV information
         
         Args:
             pdf_path: Path to the PDF file
             output_dir: Directory to save intermediate and final files
+            save_files: Write the raw text, clean text and regex output files.
+                        When False everything stays in memory and nothing is written.
         
         Returns:
             CVInfo object with extracted information
@@ -25,6 +34,13 @@ class IntegratedCVProcessor:
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
+        if not save_files:
+            try:
+                raw_text = self.extract_raw_text(pdf_path)
+                return self.regex_extractor.extract_cv_info_from_text(raw_text)
+            except Exception as e:
+                raise Exception(f"Error processing PDF: {e}")
+        
         # Set default output directory
         if output_dir is None:
             output_dir = os.path.dirname(pdf_path)
@@ -44,16 +60,16 @@ class IntegratedCVProcessor:
         try:
             # Step 1: Extract raw text (no cleaning for regex processing)
             print("\n[1/3] Extracting raw text from PDF...")
-            raw_text = self.pdf_extractor.extract_text(pdf_path, clean=False)
+            raw_text = self.extract_raw_text(pdf_path)
             
             # Save raw text
             with open(raw_text_file, 'w', encoding='utf-8') as f:
                 f.write(raw_text)
             print(f"Raw text saved to: {raw_text_file}")
             
-            # Step 2: Extract clean text (for pattern matching)
-            print("\n[2/3] Extracting clean text from PDF...")
-            clean_text = self.pdf_extractor.extract_text(pdf_path, clean=True)
+            # Step 2: Derive clean text (for pattern matching) from the raw text
+            print("\n[2/3] Cleaning extracted text...")
+            clean_text = self.pdf_extractor.clean_text(raw_text)
             
             # Save clean text
             with open(clean_text_file, 'w', encoding='utf-8') as f:
@@ -62,7 +78,7 @@ class IntegratedCVProcessor:
             
             # Step 3: Extract CV information using regex
             print("\n[3/3] Extracting CV information using regex...")
-            cv_info = self.regex_extractor.extract_cv_info(raw_text_file)
+            cv_info = self.regex_extractor.extract_cv_info_from_text(raw_text)
             
             # Save formatted CV information
             self.regex_extractor.save_formatted_output(cv_info, regex_output_file)
@@ -75,13 +91,20 @@ class IntegratedCVProcessor:
         except Exception as e:
             raise Exception(f"Error processing PDF: {e}")
     
-    def process_multiple_pdfs(self, pdf_directory: str, output_dir: str = None) -> dict:
+    def extract_raw_text(self, pdf_path: str) -> str:
+        """Extract the raw text of a PDF once, through the text cache when available"""
+        if self.text_cache is not None:
+            return self.text_cache.get_text(pdf_path, clean=False)
+        return self.pdf_extractor.extract_text(pdf_path, clean=False)
+    
+    def process_multiple_pdfs(self, pdf_directory: str, output_dir: str = None, save_files: bool = True) -> dict:
         """
         Process multiple PDF files in a directory
         
         Args:
             pdf_directory: Directory containing PDF files
             output_dir: Directory to save all outputs
+            save_files: Write intermediate and output files for every PDF
         
         Returns:
             Dictionary mapping PDF filenames to CVInfo objects
@@ -113,7 +136,7 @@ class IntegratedCVProcessor:
             print(f"{'='*60}")
             
             try:
-                cv_info = self.process_pdf(pdf_path, output_dir)
+                cv_info = self.process_pdf(pdf_path, output_dir, save_files)
                 results[pdf_file] = cv_info
                 print(f"Successfully processed {pdf_file}")
             except Exception as e:
@@ -150,6 +173,7 @@ def main():
     parser.add_argument('--single', action='store_true', help='Process single PDF file (default: auto-detect)')
     parser.add_argument('--multiple', action='store_true', help='Process multiple PDF files in directory')
     parser.add_argument('--preview', action='store_true', help='Show preview of extracted information')
+    parser.add_argument('--no-save', action='store_true', help='Process in memory without writing any output files')
     
     args = parser.parse_args()
     
@@ -160,7 +184,7 @@ def main():
         if os.path.isfile(args.input) and args.input.lower().endswith('.pdf'):
             # Single file mode
             print("Processing single PDF file...")
-            cv_info = processor.process_pdf(args.input, args.output)
+            cv_info = processor.process_pdf(args.input, args.output, save_files=not args.no_save)
             
             if args.preview:
                 print(f"\n{'='*50}")
@@ -173,7 +197,7 @@ def main():
         elif os.path.isdir(args.input):
             # Multiple files mode
             print("Processing multiple PDF files...")
-            results = processor.process_multiple_pdfs(args.input, args.output)
+            results = processor.process_multiple_pdfs(args.input, args.output, save_files=not args.no_save)
             
             if args.preview and results:
                 # Show preview of first successful result
@@ -238,6 +262,7 @@ if __name__ == "__main__":
         print("  --single        : Force single file mode")
         print("  --multiple      : Force multiple files mode")  
         print("  --preview       : Show preview of extracted information")
+        print("  --no-save       : Process in memory, write no files")
         
         # Show example with existing file if available
         if os.path.exists("data/10276858.pdf"):
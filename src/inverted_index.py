@@ -0,0 +1,304 @@
+import os
+import pickle
+import argparse
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pdf_extractor import PDFTextExtractor
+from LevenshteinDistance import levenshtein_within_batch
+
+DEFAULT_INDEX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "index.pkl")
+INDEX_VERSION = 3
+
+
+class InvertedIndex:
+    """
+        Positional inverted index over cleaned CV text.
+
+        postings maps term -> {doc_id: [token positions]}, so the term
+        frequency of a document is the length of its position list.
+        doc_terms is the forward index (doc_id -> distinct terms) used to
+        remove a document; removed doc ids are left as None in doc_paths.
+        doc_lengths holds the clean text length of every document, which
+        tells whether score_bounds still describe its current text.
+    """
+
+    def __init__(self):
+        self.doc_paths: List[Optional[str]] = []
+        self.doc_ids: Dict[str, int] = {}
+        self.postings: Dict[str, Dict[int, List[int]]] = {}
+        self.doc_terms: Dict[int, List[str]] = {}
+        self.doc_lengths: Dict[int, int] = {}
+        self._normalizer = PDFTextExtractor()
+
+    def tokenize(self, text: str) -> List[str]:
+        """
+            Split text into terms the same way clean_text normalizes it
+        """
+        return self._normalizer.clean_text(text).split()
+
+    def add_document(self, doc_path: str, clean_text: str) -> int:
+        """
+            Index the clean text of one document and return its doc id
+        """
+        if doc_path in self.doc_ids:
+            raise ValueError(f"Document already indexed: {doc_path}")
+
+        doc_id = len(self.doc_paths)
+        self.doc_paths.append(doc_path)
+        self.doc_ids[doc_path] = doc_id
+
+        # clean_text output only contains word characters and single spaces
+        terms = {}
+        for position, term in enumerate(clean_text.split()):
+            terms.setdefault(term, []).append(position)
+
+        for term, positions in terms.items():
+            self.postings.setdefault(term, {})[doc_id] = positions
+        self.doc_terms[doc_id] = list(terms)
+        self.doc_lengths[doc_id] = len(clean_text)
+
+        return doc_id
+
+    def remove_document(self, doc_path: str) -> bool:
+        """
+            Drop a document and its postings; returns False when it was not indexed
+        """
+        doc_id = self.doc_ids.pop(doc_path, None)
+        if doc_id is None:
+            return False
+
+        self.doc_lengths.pop(doc_id, None)
+        for term in self.doc_terms.pop(doc_id, []):
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self.postings[term]
+
+        self.doc_paths[doc_id] = None
+        return True
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def count(self, keyword: str) -> Dict[str, int]:
+        """
+            Exact occurrences of a keyword per document path. Multi-word keywords
+            are matched as phrases using token positions.
+        """
+        terms = self.tokenize(keyword)
+        if not terms:
+            return {}
+
+        if len(terms) == 1:
+            postings = self.postings.get(terms[0], {})
+            return {self.doc_paths[doc_id]: len(positions) for doc_id, positions in postings.items()}
+
+        term_postings = [self.postings.get(term) for term in terms]
+        if not all(term_postings):
+            return {}
+
+        # Only documents containing every term can contain the phrase; start from the rarest
+        candidates = set(min(term_postings, key=len))
+        for postings in term_postings:
+            candidates &= postings.keys()
+
+        counts = {}
+        for doc_id in candidates:
+            later_positions = [set(postings[doc_id]) for postings in term_postings[1:]]
+            matches = 0
+            for start in term_postings[0][doc_id]:
+                if all(start + offset in positions for offset, positions in enumerate(later_positions, 1)):
+                    matches += 1
+            if matches > 0:
+                counts[self.doc_paths[doc_id]] = matches
+
+        return counts
+
+    def fuzzy_count(self, keyword: str, max_distance: int = 2) -> Dict[str, int]:
+        """
+            Occurrences per document of indexed terms within max_distance edits of
+            a single-word keyword. The vocabulary is scanned instead of the text.
+        """
+        terms = self.tokenize(keyword)
+        if len(terms) != 1:
+            return {}
+
+        keyword = terms[0]
+        vocabulary = [term for term in self.postings if abs(len(term) - len(keyword)) <= max_distance]
+        within = levenshtein_within_batch(keyword, vocabulary, max_distance)
+
+        counts = {}
+        for term, is_close in zip(vocabulary, within):
+            if not is_close:
+                continue
+            for doc_id, positions in self.postings[term].items():
+                doc_path = self.doc_paths[doc_id]
+                counts[doc_path] = counts.get(doc_path, 0) + len(positions)
+
+        return counts
+
+    def substring_counts(self, fragment: str) -> Dict[int, int]:
+        """
+            Overlapping occurrences of a fragment without spaces per doc id.
+            In clean text such a fragment always lies inside one term, so the
+            vocabulary is scanned instead of the text.
+        """
+        counts = {}
+        for term, postings in self.postings.items():
+            if fragment not in term:
+                continue
+            occurrences = 0
+            start = term.find(fragment)
+            while start >= 0:
+                occurrences += 1
+                start = term.find(fragment, start + 1)
+            for doc_id, positions in postings.items():
+                counts[doc_id] = counts.get(doc_id, 0) + occurrences * len(positions)
+        return counts
+
+    def score_bounds(self, keyword_list: List[str], max_distance: int = 2) -> Dict[str, Tuple[int, int]]:
+        """
+            Upper bound on the total matches a text scan (exact counts, fuzzy
+            search with max_distance for keywords without any) can score, as
+            doc path -> (clean text length the bound holds for, bound).
+
+            Per keyword, exact occurrences are at most the occurrences of each
+            of its words, exactly them for a one-word keyword. A fuzzy match
+            keeps at least one of max_distance + 1 pieces of the keyword
+            intact (each edit breaks at most one piece), so every occurrence
+            of a piece accounts for at most len(keyword) + max_distance match
+            end positions. No keyword can match more than once per position.
+        """
+        fragments = {}
+
+        def counts(fragment):
+            if fragment not in fragments:
+                fragments[fragment] = self.substring_counts(fragment)
+            return fragments[fragment]
+
+        # Per keyword: (exact is precise, [exact count maps], [(piece count map, window)] or None when unbounded)
+        plans = []
+        for keyword in keyword_list:
+            words = keyword.split()
+            exact = [counts(word) for word in words] or None
+
+            pieces = None
+            m = len(keyword)
+            if m > max_distance:
+                pieces = []
+                cuts = [m * i // (max_distance + 1) for i in range(max_distance + 2)]
+                for start, end in zip(cuts, cuts[1:]):
+                    piece_words = keyword[start:end].split()
+                    if not piece_words:
+                        pieces = None
+                        break
+                    # Occurrences of the piece are at most those of its longest word
+                    pieces.append((counts(max(piece_words, key=len)), m + max_distance - (end - start) + 1))
+            plans.append((len(words) == 1 and words[0] == keyword, exact, pieces))
+
+        bounds = {}
+        for doc_id, length in self.doc_lengths.items():
+            unbounded = length + 1
+            total = 0
+            for precise, exact, pieces in plans:
+                exact_bound = min(count.get(doc_id, 0) for count in exact) if exact is not None else unbounded
+                if precise and exact_bound > 0:
+                    # A keyword that occurs is never searched fuzzily
+                    total += exact_bound
+                    continue
+                fuzzy_bound = (sum(count.get(doc_id, 0) * window for count, window in pieces)
+                               if pieces is not None else unbounded)
+                total += min(max(exact_bound, fuzzy_bound), unbounded)
+            bounds[self.doc_paths[doc_id]] = (length, total)
+        return bounds
+
+    def save(self, index_file: str = DEFAULT_INDEX_FILE):
+        """
+            Save the index to disk
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(index_file)), exist_ok=True)
+        tmp_file = f"{index_file}.tmp"
+        with open(tmp_file, "wb") as f:
+            pickle.dump({
+                "version": INDEX_VERSION,
+                "doc_paths": self.doc_paths,
+                "postings": self.postings,
+                "doc_terms": self.doc_terms,
+                "doc_lengths": self.doc_lengths,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, index_file)
+
+    @classmethod
+    def load(cls, index_file: str = DEFAULT_INDEX_FILE) -> "InvertedIndex":
+        """
+            Load an index saved with save()
+        """
+        if not os.path.exists(index_file):
+            raise FileNotFoundError(f"Index file not found: {index_file}")
+
+        with open(index_file, "rb") as f:
+            data = pickle.load(f)
+
+        version = data.get("version")
+        if version not in (1, 2, INDEX_VERSION):
+            raise ValueError(f"Unsupported index version in {index_file}; rebuild the index")
+
+        index = cls()
+        index.doc_paths = data["doc_paths"]
+        index.doc_ids = {path: doc_id for doc_id, path in enumerate(index.doc_paths) if path is not None}
+        index.postings = data["postings"]
+
+        if version == 1:
+            # Version 1 had no forward index; derive it from the postings
+            for term, postings in index.postings.items():
+                for doc_id in postings:
+                    index.doc_terms.setdefault(doc_id, []).append(term)
+        else:
+            index.doc_terms = data["doc_terms"]
+        # Documents indexed before version 3 have no length, so no score bounds
+        index.doc_lengths = data.get("doc_lengths", {})
+        return index
+
+
+def build_index(cv_paths: Iterable[str], text_cache, base_dir: str = "..") -> InvertedIndex:
+    """
+        Build an index over the clean text of every existing CV.
+
+        cv_paths are database paths (data/<CATEGORY>/<id>.pdf), resolved
+        against base_dir when reading the PDF.
+    """
+    index = InvertedIndex()
+    for cv_path in cv_paths:
+        if cv_path in index.doc_ids:
+            continue
+        pdf_path = os.path.join(base_dir, cv_path)
+        if not os.path.isfile(pdf_path):
+            continue
+        index.add_document(cv_path, text_cache.get_text(pdf_path, clean=True))
+
+    text_cache.flush()
+    return index
+
+
+def main():
+    """Build the index for every CV registered in the database"""
+    parser = argparse.ArgumentParser(description='Build the inverted index over all CVs in the database')
+    parser.add_argument('-o', '--output', default=DEFAULT_INDEX_FILE, help='Index file to write')
+    parser.add_argument('--base-dir', default='..', help='Directory the database cv_path values are relative to')
+    args = parser.parse_args()
+
+    from db import get_paths
+    from text_cache import PDFTextCache
+
+    cv_paths = [row["cv_path"] for row in get_paths()]
+    index = build_index(cv_paths, PDFTextCache(), args.base_dir)
+    index.save(args.output)
+
+    print(f"Indexed {len(index)} documents, {len(index.postings)} terms")
+    print(f"Index saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterator, List
 
 def compute_lps(pattern: str) -> List[int]:
         lps = [0] * len(pattern)
@@ -18,27 +18,38 @@ def compute_lps(pattern: str) -> List[int]:
                     i += 1
         return lps
 
-def kmp_search(pattern: str, text: str) -> int:
-    lps = compute_lps(pattern)
-    indices = []
-    i = j = 0
+class KMPMatcher:
+    """KMP matcher that keeps the LPS array of its pattern for reuse across texts"""
 
-    while i < len(text):
-        if pattern[j] == text[i]:
-            i += 1
-            j += 1
-        
-        if j == len(pattern):
-            indices.append(i - j)
-            j = lps[j - 1]
-        elif i < len(text) and pattern[j] != text[i]:
-            if j != 0:
-                j = lps[j - 1]
-            else:
-                i += 1
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.lps = compute_lps(pattern)
 
-    # Mengembalikan daftar indeks semua kemunculan pola dalam teks.
-    # return indices 
+    def finditer(self, text: str) -> Iterator[int]:
+        """Yield the start index of every (possibly overlapping) occurrence"""
+        pattern = self.pattern
+        lps = self.lps
+        if not pattern:
+            return
 
-    return len(indices)  # Mengembalikan jumlah kemunculan pola dalam teks.
+        i = j = 0
+        while i < len(text):
+            if pattern[j] == text[i]:
+                i += 1
+                j += 1
+            
+            if j == len(pattern):
+                yield i - j
+                j = lps[j - 1]
+            elif i < len(text) and pattern[j] != text[i]:
+                if j != 0:
+                    j = lps[j - 1]
+                else:
+                    i += 1
 
+    def count(self, text: str) -> int:
+        return sum(1 for _ in self.finditer(text))
+
+def kmp_search(pattern: str, text: str) -> int:
+    # Mengembalikan jumlah kemunculan pola dalam teks.
+    return KMPMatcher(pattern).count(text)
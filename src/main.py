@@ -1,20 +1,35 @@
-import db
+import startup
 import sys
-from PyQt5.QtWidgets import QApplication
-from gui import JuliusCVApp
+import argparse
+from dotenv import load_dotenv
 
+# The window comes first: PyQt and gui are imported here, while the search
+# backend (database, PDF engines, numpy) is imported and warmed up by the GUI
+# in a background thread
 def main():
-    # db.create_db()
-    # print("Database created successfully.")
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description='JuliusCV applicant tracking system')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Print import times and the time to first paint once the app is ready')
+    args, qt_args = parser.parse_known_args()
+
+    if args.profile_startup:
+        startup.enable(("first paint", "page loaded", "backend ready"))
+
+    load_dotenv()
+    with startup.timed("import PyQt5 and gui"):
+        from PyQt5.QtWidgets import QApplication
+        from PyQt5.QtCore import QTimer
+        from gui import JuliusCVApp
+    from tracing import setup_logging
+
+    setup_logging()
+    app = QApplication(sys.argv[:1] + qt_args)
     window = JuliusCVApp()
     window.show()
+    # Runs once the event loop has handled the events queued by show(), the first paint included
+    QTimer.singleShot(0, lambda: startup.mark("first paint"))
     sys.exit(app.exec_())
 
 
-    
-    
-    
-
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
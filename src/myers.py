@@ -0,0 +1,81 @@
+from typing import Dict, Iterator, List
+
+
+class MyersMatcher:
+    """
+        Myers' bit-vector algorithm for approximate substring matching.
+
+        A match ends at text position j when some substring ending at j is
+        within max_distance edits (insert, delete, replace) of the pattern.
+        Each text character costs O(ceil(m / w)) word operations; Python
+        integers grow as needed, so patterns longer than a machine word work.
+    """
+
+    def __init__(self, pattern: str, max_distance: int = 2):
+        self.pattern = pattern
+        self.max_distance = max_distance
+        self.mask = (1 << len(pattern)) - 1
+        self.high_bit = 1 << (len(pattern) - 1) if pattern else 0
+
+        # peq[c] has bit i set when pattern[i] == c
+        self.peq: Dict[str, int] = {}
+        for i, ch in enumerate(pattern):
+            self.peq[ch] = self.peq.get(ch, 0) | (1 << i)
+
+    def finditer(self, text: str) -> Iterator[int]:
+        """
+            Yield the end position (index of the last character) of every match
+        """
+        m = len(self.pattern)
+        if m == 0:
+            return
+
+        k = self.max_distance
+        peq = self.peq
+        mask = self.mask
+        high_bit = self.high_bit
+
+        pv = mask
+        mv = 0
+        score = m
+
+        for j, ch in enumerate(text):
+            eq = peq.get(ch, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & mask)
+            mh = pv & xh
+
+            if ph & high_bit:
+                score += 1
+            elif mh & high_bit:
+                score -= 1
+
+            # Row 0 is all zeros for substring search, so nothing is shifted in
+            ph = (ph << 1) & mask
+            mh = (mh << 1) & mask
+            pv = mh | (~(xv | ph) & mask)
+            mv = ph & xv
+
+            if score <= k:
+                yield j
+
+    def count(self, text: str) -> int:
+        """
+            Number of text positions where an approximate match ends
+        """
+        return sum(1 for _ in self.finditer(text))
+
+
+def myers_search(text: str, pattern: str, max_distance: int = 2) -> List[int]:
+    return list(MyersMatcher(pattern, max_distance).finditer(text))
+
+
+def myers_count(text: str, pattern: str, max_distance: int = 2) -> int:
+    return MyersMatcher(pattern, max_distance).count(text)
+
+
+if __name__ == "__main__":
+    text = "saya suka python python dan pyrthonpythonp"
+    res = myers_search(text, "python", 1)
+    print(res)
@@ -0,0 +1,45 @@
+from functools import lru_cache
+from typing import Tuple, Union
+
+from kmp import KMPMatcher
+from boyer_moore import BoyerMooreMatcher
+from aho_corasick import AhoCorasick
+from myers import MyersMatcher
+
+# Compiled patterns kept warm across searches (per process)
+PATTERN_CACHE_SIZE = 512
+
+
+def compile_pattern(keyword: Union[str, Tuple[str, ...]], algorithm: str, max_distance: int = 2):
+    """
+        Return a reusable matcher for a keyword.
+
+        algorithm is KMP, BM or FUZZY (Myers bit-vector, using max_distance),
+        whose matchers have count(text), or AC, for which keyword is a tuple
+        of keywords sharing one automaton with count_all(text).
+        Compiled matchers are kept in a bounded LRU cache, so the LPS array,
+        shift tables or bit masks are built once per keyword, not per document.
+    """
+    return _compile_pattern(keyword, algorithm.upper(), max_distance)
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def _compile_pattern(keyword, algorithm: str, max_distance: int):
+    if algorithm == "KMP":
+        return KMPMatcher(keyword)
+    if algorithm == "BM":
+        return BoyerMooreMatcher(keyword)
+    if algorithm == "FUZZY":
+        return MyersMatcher(keyword, max_distance)
+    if algorithm == "AC":
+        return AhoCorasick(keyword)
+    raise ValueError(f"Unknown search algorithm: {algorithm}")
+
+
+def pattern_cache_info():
+    """Hit/miss statistics of the compiled pattern cache"""
+    return _compile_pattern.cache_info()
+
+
+def clear_pattern_cache():
+    _compile_pattern.cache_clear()
@@ -0,0 +1,172 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Dict, List
+
+# Engine names
+PDFPLUMBER = "pdfplumber"
+PYPDFIUM2 = "pypdfium2"
+PDFMINER = "pdfminer"
+
+# Keyword matching only needs the words, so it defaults to the fast engine;
+# CVRegexExtractor relies on pdfplumber's line layout to find sections
+DEFAULT_MATCH_ENGINE = PYPDFIUM2
+DEFAULT_LAYOUT_ENGINE = PDFPLUMBER
+
+
+class PDFEngine(ABC):
+    """
+        One way of turning a PDF into text. extract_pages returns the text of
+        every page in order; the backend library is imported on first use.
+    """
+
+    name = None
+    module = None
+
+    @classmethod
+    def available(cls) -> bool:
+        return find_spec(cls.module) is not None
+
+    def load(self):
+        """Import the backend library now instead of on the first PDF"""
+        import_module(self.module)
+
+    @abstractmethod
+    def extract_pages(self, pdf_path: str) -> List[str]:
+        """Text of every page of a PDF, in page order"""
+
+
+class PdfplumberEngine(PDFEngine):
+    """pdfplumber: groups characters into lines by position (layout-aware, slowest)"""
+
+    name = PDFPLUMBER
+    module = "pdfplumber"
+
+    def extract_pages(self, pdf_path: str) -> List[str]:
+        import pdfplumber
+
+        with pdfplumber.open(pdf_path) as pdf:
+            return [page.extract_text() or "" for page in pdf.pages]
+
+
+class Pypdfium2Engine(PDFEngine):
+    """
+        pypdfium2: PDFium's text layer in content order, without layout
+        analysis (fastest).
+
+        Many CVs in data/ have no space characters, and PDFium's generated
+        spaces miss part of the word breaks there, so the glyph boxes fill
+        them in: a horizontal gap wider than WORD_GAP times the glyph height
+        is a word break, a baseline moving by more than half the glyph
+        height a line break. PDFium's own line breaks are dropped for these.
+    """
+
+    name = PYPDFIUM2
+    module = "pypdfium2"
+
+    WORD_GAP = 0.025
+
+    # PDFium is not thread-safe, so threads of one process take turns
+    _lock = threading.Lock()
+
+    def extract_pages(self, pdf_path: str) -> List[str]:
+        import pypdfium2
+
+        with self._lock:
+            pdf = pypdfium2.PdfDocument(pdf_path)
+            try:
+                pages = []
+                for page in pdf:
+                    text_page = page.get_textpage()
+                    pages.append(self._page_text(text_page))
+                    text_page.close()
+                    page.close()
+                return pages
+            finally:
+                pdf.close()
+
+    def _page_text(self, text_page) -> str:
+        import pypdfium2.raw as pdfium
+
+        handle = text_page.raw
+        box = pdfium.FS_RECTF()
+        chars = []
+        # (right edge, baseline, height) of the previous glyph, None after whitespace
+        previous = None
+
+        for i in range(pdfium.FPDFText_CountChars(handle)):
+            ch = chr(pdfium.FPDFText_GetUnicode(handle, i))
+            if ch in "\r\n":
+                continue
+            if ch.isspace():
+                # Real or PDFium-generated space: one word break
+                if chars and chars[-1] not in " \n":
+                    chars.append(" ")
+                previous = None
+                continue
+
+            pdfium.FPDFText_GetLooseCharBox(handle, i, box)
+            if previous is not None:
+                right, baseline, height = previous
+                if abs(box.bottom - baseline) > height / 2:
+                    chars.append("\n")
+                elif box.left - right > height * self.WORD_GAP:
+                    chars.append(" ")
+            chars.append(ch)
+            previous = (box.right, box.bottom, box.top - box.bottom)
+
+        return "".join(chars)
+
+
+class PdfminerEngine(PDFEngine):
+    """pdfminer.six: layout analysis into text boxes (the library pdfplumber builds on)"""
+
+    name = PDFMINER
+    module = "pdfminer"
+
+    def extract_pages(self, pdf_path: str) -> List[str]:
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+
+        return ["".join(element.get_text() for element in page if isinstance(element, LTTextContainer))
+                for page in extract_pages(pdf_path)]
+
+
+ENGINES = {engine.name: engine for engine in (PdfplumberEngine, Pypdfium2Engine, PdfminerEngine)}
+
+_instances: Dict[str, PDFEngine] = {}
+
+
+def get_engine(name: str) -> PDFEngine:
+    """The shared engine instance for a name from ENGINES"""
+    engine = _instances.get(name)
+    if engine is None:
+        if name not in ENGINES:
+            raise ValueError(f"Unknown PDF engine: {name} (choose from {', '.join(ENGINES)})")
+        engine = _instances.setdefault(name, ENGINES[name]())
+    return engine
+
+
+def available_engines() -> List[str]:
+    """Names of the engines whose library is installed"""
+    return [name for name, engine in ENGINES.items() if engine.available()]
+
+
+def _configured(variable: str, default: str) -> str:
+    name = (os.getenv(variable) or "").strip().lower()
+    if name:
+        return name
+    # The default falls back to pdfplumber when its library is missing
+    return default if ENGINES[default].available() else PDFPLUMBER
+
+
+def match_engine() -> str:
+    """Engine for the text that keywords are matched against (PDF_MATCH_ENGINE)"""
+    return _configured("PDF_MATCH_ENGINE", DEFAULT_MATCH_ENGINE)
+
+
+def layout_engine() -> str:
+    """Engine for the text that CV sections are extracted from (PDF_LAYOUT_ENGINE)"""
+    return _configured("PDF_LAYOUT_ENGINE", DEFAULT_LAYOUT_ENGINE)
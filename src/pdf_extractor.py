@@ -1,8 +1,16 @@
-import pdfplumber
 import re
 import os
+import logging
+
+from pdf_engines import PDFPLUMBER, get_engine
+
+logger = logging.getLogger(__name__)
 
 class PDFTextExtractor:
+
+    def __init__(self, engine: str = PDFPLUMBER):
+        # Name of the pdf_engines backend that reads the PDF
+        self.engine = engine
    
     def extract_text(self, pdf_path: str, clean: bool = True) -> str:
         """
@@ -14,12 +22,10 @@ class PDFTextExtractor:
         text = ""
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    print(f"Processing page {page_num}...")
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + " "
+            for page_num, page_text in enumerate(get_engine(self.engine).extract_pages(pdf_path), 1):
+                logger.debug("Processing page %d of %s", page_num, pdf_path)
+                if page_text:
+                    text += page_text + " "
         except Exception as e:
             raise Exception(f"Failed to extract text from PDF: {e}")
         
@@ -0,0 +1,83 @@
+import heapq
+from typing import Iterable, List, Optional, Tuple
+
+# (row index, total matches, [{"keyword", "count"}], fuzzy used)
+ScanResult = Tuple[int, int, List[dict], bool]
+
+
+class TopN:
+    """
+        Bounded min-heap holding the best n scan results.
+
+        Results are ordered by total matches, then by database row order
+        (earlier rows win ties), so memory and push cost depend only on n.
+    """
+
+    def __init__(self, n: int):
+        self.n = max(0, n)
+        self._heap: List[Tuple[int, int, ScanResult]] = []
+
+    def push(self, result: ScanResult) -> bool:
+        """
+            Offer one result; returns True when it entered the top n
+        """
+        row_index, total_matches = result[0], result[1]
+        entry = (total_matches, -row_index, result)
+
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, entry)
+            return True
+        if self.n and entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def push_all(self, results: Iterable[ScanResult]) -> bool:
+        changed = False
+        for result in results:
+            if self.push(result):
+                changed = True
+        return changed
+
+    @property
+    def full(self) -> bool:
+        return len(self._heap) >= self.n
+
+    @property
+    def threshold(self) -> Optional[int]:
+        """Lowest score still in the top n, or None while there is room"""
+        return self._heap[0][0] if self.full and self._heap else None
+
+    def can_improve(self, upper_bound: float) -> bool:
+        """
+            Whether a document scoring at most upper_bound could still enter.
+            An equal score may win on row order, so only a lower bound is final.
+        """
+        if self.n == 0:
+            return False
+        threshold = self.threshold
+        return threshold is None or upper_bound >= threshold
+
+    def results(self) -> List[ScanResult]:
+        """The kept results, best first"""
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+
+def max_matches(text_length: Optional[int], keyword_count: int) -> float:
+    """
+        Upper bound on the total matches a document of text_length characters
+        can score: every keyword (exact or fuzzy) matches at most once per
+        text position. Unknown lengths are unbounded.
+    """
+    if text_length is None:
+        return float("inf")
+    return text_length * keyword_count
+
+
+def stream_top_n(results: Iterable[ScanResult], n: int) -> List[ScanResult]:
+    """
+        Keep the best n of a stream of results without materializing it
+    """
+    top = TopN(n)
+    top.push_all(results)
+    return top.results()
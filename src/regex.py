@@ -1,5 +1,6 @@
 import re
 import os
+from bisect import bisect_right
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
@@ -56,53 +57,65 @@ class CVRegexExtractor:
             'experience': [r'\bexperience?\b', r'\b\w+\s+experience?\b', r'\bwork\s+history?\b', r'\b\w+\s+work\s+history?\b'],
             'education': [r'\beducation?\b', r'\b\w+\s+education?\b']
         }
+
+        # Every header pattern in one compiled alternation; the named group that
+        # matched tells the section. Each pattern ends with its own section word,
+        # so a line can only ever match one section.
+        alternatives = []
+        self.header_groups = {}
+        for section, patterns in self.section_headers.items():
+            for i, pattern in enumerate(patterns):
+                group = f'{section}_{i}'
+                self.header_groups[group] = section
+                alternatives.append(f'(?P<{group}>{pattern})')
+
+        self.section_header_pattern = re.compile(
+            rf'^\s*(?:{"|".join(alternatives)})\s*:?\s*$',
+            re.IGNORECASE
+        )
+
+    def match_section_header(self, line: str) -> Optional[str]:
+        """Name of the section a (stripped) line is the header of, or None"""
+        match = self.section_header_pattern.match(line)
+        return self.header_groups[match.lastgroup] if match else None
     
     def find_section_boundaries(self, text: str) -> Dict[str, tuple]:
-        """Find all section headers and their positions"""
+        """Find all section headers and their positions in one pass; the last header of a section wins"""
         sections_found = {}
         
-        # Create a pattern that matches any section header
-        all_patterns = []
-        section_map = {}
-        
-        for section, patterns in self.section_headers.items():
-            for pattern in patterns:
-                full_pattern = rf'^\s*{pattern}\s*:?\s*$'
-                all_patterns.append(full_pattern)
-                section_map[full_pattern] = section
-        
-        combined_pattern = '|'.join([f'({pattern})' for pattern in all_patterns])
-        
-        lines = text.split('\n')
-        for i, line in enumerate(lines):
+        for i, line in enumerate(text.split('\n')):
             line_stripped = line.strip()
             if not line_stripped:
                 continue
-                
-            # Check each section pattern
-            for section, patterns in self.section_headers.items():
-                for pattern in patterns:
-                    if re.match(rf'^\s*{pattern}\s*:?\s*$', line_stripped, re.IGNORECASE):
-                        sections_found[section] = (i, line_stripped)
-                        break
+
+            section = self.match_section_header(line_stripped)
+            if section is not None:
+                sections_found[section] = (i, line_stripped)
         
         return sections_found
     
-    def extract_section_content_flexible(self, text: str, section_name: str) -> List[str]:
-        """Extract ALL content from a section without any filtering"""
-        lines = text.split('\n')
-        section_boundaries = self.find_section_boundaries(text)
+    def extract_section_content_flexible(self, text: str, section_name: str,
+                                         section_boundaries: Dict[str, tuple] = None,
+                                         lines: List[str] = None) -> List[str]:
+        """
+        Extract ALL content from a section without any filtering.
+        section_boundaries and lines (text.split('\\n')) can be passed in to
+        share one scan of the text between sections.
+        """
+        if lines is None:
+            lines = text.split('\n')
+        if section_boundaries is None:
+            section_boundaries = self.find_section_boundaries(text)
         
         if section_name not in section_boundaries:
             return []
         
         start_line = section_boundaries[section_name][0]
         
-        # Find the next section boundary
-        end_line = len(lines)
-        for other_section, (line_num, _) in section_boundaries.items():
-            if line_num > start_line and line_num < end_line:
-                end_line = line_num
+        # The section ends at the next section header
+        header_lines = sorted(line_num for line_num, _ in section_boundaries.values())
+        next_header = bisect_right(header_lines, start_line)
+        end_line = header_lines[next_header] if next_header < len(header_lines) else len(lines)
         
         # Extract ALL content between boundaries (no filtering)
         content_lines = []
@@ -127,17 +140,8 @@ class CVRegexExtractor:
         lines = [l.strip() for l in text.splitlines() if l.strip()]
 
         for line in lines[:10]:
-            # Skip known section headers
-            is_section_header = False
-            for section, patterns in self.section_headers.items():
-                for pattern in patterns:
-                    if re.match(rf'^\s*{pattern}\s*:?\s*$', line, re.IGNORECASE):
-                        is_section_header = True
-                        break
-                if is_section_header:
-                    break
-            
-            if is_section_header:
+            # Stop at the first section header
+            if self.match_section_header(line) is not None:
                 break
 
             # Limit overly long lines (prevent summary sentences)
@@ -150,9 +154,10 @@ class CVRegexExtractor:
 
         return ""
     
-    def extract_experience_flexible(self, text: str) -> List[Dict[str, str]]:
+    def extract_experience_flexible(self, text: str, section_boundaries: Dict[str, tuple] = None,
+                                    lines: List[str] = None) -> List[Dict[str, str]]:
         """Extract ALL experience content and organize it simply"""
-        experience_content = self.extract_section_content_flexible(text, 'experience')
+        experience_content = self.extract_section_content_flexible(text, 'experience', section_boundaries, lines)
         
         if not experience_content:
             return []
@@ -166,9 +171,10 @@ class CVRegexExtractor:
         return experiences
     
 
-    def extract_education_flexible(self, text: str) -> List[Dict[str, str]]:
+    def extract_education_flexible(self, text: str, section_boundaries: Dict[str, tuple] = None,
+                                   lines: List[str] = None) -> List[Dict[str, str]]:
         """Extract ALL education content and organize it simply"""
-        education_content = self.extract_section_content_flexible(text, 'education')
+        education_content = self.extract_section_content_flexible(text, 'education', section_boundaries, lines)
         
         if not education_content:
             return []
@@ -312,7 +318,14 @@ class CVRegexExtractor:
         try:
             # Read the extracted text
             text = self.read_extracted_text(file_path)
-            
+        except Exception as e:
+            raise Exception(f"Error extracting CV information: {e}")
+
+        return self.extract_cv_info_from_text(text)
+
+    def extract_cv_info_from_text(self, text: str) -> CVInfo:
+        """Extract all CV information from raw (uncleaned) text already in memory"""
+        try:
             # Create CVInfo object
             cv_info = CVInfo()
             cv_info.raw_text = text
@@ -320,15 +333,19 @@ class CVRegexExtractor:
             # Extract title
             cv_info.title = self.extract_title(text)
             
+            # Scan the section headers once and share them between all sections
+            lines = text.split('\n')
+            boundaries = self.find_section_boundaries(text)
+            
             # Extract sections with flexible methods (ALL content under each section)
-            cv_info.skills = self.extract_section_content_flexible(text, 'skills')
-            cv_info.summary = self.extract_section_content_flexible(text, 'summary')
-            cv_info.highlights = self.extract_section_content_flexible(text, 'highlights')
-            cv_info.accomplishments = self.extract_section_content_flexible(text, 'accomplishments')
+            cv_info.skills = self.extract_section_content_flexible(text, 'skills', boundaries, lines)
+            cv_info.summary = self.extract_section_content_flexible(text, 'summary', boundaries, lines)
+            cv_info.highlights = self.extract_section_content_flexible(text, 'highlights', boundaries, lines)
+            cv_info.accomplishments = self.extract_section_content_flexible(text, 'accomplishments', boundaries, lines)
             
             # Extract experience and education (ALL content)
-            cv_info.experience = self.extract_experience_flexible(text)
-            cv_info.education = self.extract_education_flexible(text)
+            cv_info.experience = self.extract_experience_flexible(text, boundaries, lines)
+            cv_info.education = self.extract_education_flexible(text, boundaries, lines)
             
             return cv_info
             
@@ -0,0 +1,274 @@
+import os
+import sys
+import json
+import time
+import argparse
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from ingest import DEFAULT_DATA_DIR, extract_texts, find_pdfs
+from inverted_index import DEFAULT_INDEX_FILE, InvertedIndex
+from corpus_store import DEFAULT_CORPUS_FILE, CorpusStore, build_corpus
+from suffix_array import DEFAULT_SUFFIX_ARRAY_FILE, SuffixArray
+from text_cache import PDFTextCache, file_hash
+
+DEFAULT_MANIFEST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "manifest.json")
+MANIFEST_VERSION = 1
+
+# Smaller change sets are extracted in this process instead of starting a pool
+POOL_THRESHOLD = 16
+
+# (index file, mtime, index) of the last index loaded or saved, so --watch does
+# not unpickle the index on every poll
+_loaded_index = None
+
+
+@dataclass
+class ReindexPlan:
+    """cv_path values grouped by what has to happen to them"""
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    # Same content, new mtime: only the manifest is updated
+    touched: List[str] = field(default_factory=list)
+    # Manifest entries after the update: cv_path -> size, mtime, hash, detail_ids
+    documents: Dict[str, dict] = field(default_factory=dict)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.changed or self.removed or self.touched)
+
+
+def load_manifest(manifest_file: str = DEFAULT_MANIFEST_FILE) -> Dict[str, dict]:
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data["documents"]
+
+
+def save_manifest(documents: Dict[str, dict], manifest_file: str = DEFAULT_MANIFEST_FILE):
+    os.makedirs(os.path.dirname(os.path.abspath(manifest_file)), exist_ok=True)
+    tmp_file = f"{manifest_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "documents": documents}, f)
+    os.replace(tmp_file, manifest_file)
+
+
+def plan_changes(pdfs: Dict[str, str], detail_ids: Dict[str, List[int]], manifest: Dict[str, dict],
+                 indexed: set) -> ReindexPlan:
+    """
+        Diff the PDFs on disk that are registered in the database against the
+        manifest. A file is only hashed when its size or mtime changed.
+    """
+    plan = ReindexPlan()
+
+    for cv_path in sorted(pdfs.keys() & detail_ids.keys()):
+        pdf_path = pdfs[cv_path]
+        stat = os.stat(pdf_path)
+        entry = manifest.get(cv_path)
+        ids = sorted(detail_ids[cv_path])
+
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+            plan.documents[cv_path] = dict(entry, detail_ids=ids)
+            if cv_path not in indexed:
+                plan.added.append(cv_path)
+            elif entry.get("detail_ids") != ids:
+                # Same file, but registered for different applications
+                plan.changed.append(cv_path)
+            continue
+
+        digest = file_hash(pdf_path)
+        plan.documents[cv_path] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": digest, "detail_ids": ids}
+        if entry is None or cv_path not in indexed:
+            plan.added.append(cv_path)
+        elif entry["hash"] != digest or entry.get("detail_ids") != ids:
+            plan.changed.append(cv_path)
+        else:
+            plan.touched.append(cv_path)
+
+    plan.removed = sorted((manifest.keys() | indexed) - plan.documents.keys())
+    return plan
+
+
+def extract_clean_texts(jobs: List[Tuple[List[int], str]], text_cache: PDFTextCache,
+                        workers: int = None) -> List[Tuple[int, str, str]]:
+    """(detail_id, raw_text, clean_text) for every (detail_ids, pdf_path) job"""
+    if len(jobs) < POOL_THRESHOLD or workers == 1:
+        rows = []
+        for ids, pdf_path in jobs:
+            raw_text, clean_text = text_cache.get_texts(pdf_path)
+            rows.extend((detail_id, raw_text, clean_text) for detail_id in ids)
+        text_cache.flush()
+        return rows
+
+    rows = list(extract_texts(jobs, workers))
+    # The workers wrote through their own cache instances
+    text_cache.refresh()
+    return rows
+
+
+def reindex(data_dir: str = DEFAULT_DATA_DIR, index_file: str = DEFAULT_INDEX_FILE,
+            manifest_file: str = DEFAULT_MANIFEST_FILE, workers: int = None,
+            update_db_text: bool = True, text_cache: PDFTextCache = None,
+            corpus_file: str = DEFAULT_CORPUS_FILE,
+            suffix_array_file: str = DEFAULT_SUFFIX_ARRAY_FILE) -> ReindexPlan:
+    """
+        Bring the inverted index, the text cache and (optionally) the
+        ApplicationText table up to date with the CVs in data_dir, touching
+        only new, changed and removed files. An existing corpus store is
+        rewritten from the (by then warm) text cache, and an existing suffix
+        array is rebuilt over it.
+
+        Returns:
+            The plan that was applied
+    """
+    from db import create_text_table, get_paths, save_cv_texts, delete_cv_texts
+
+    if not os.path.isdir(data_dir):
+        raise FileNotFoundError(f"Directory not found: {data_dir}")
+
+    text_cache = text_cache or PDFTextCache()
+    pdfs = find_pdfs(data_dir)
+
+    # Several applications may point at the same CV file
+    detail_ids = {}
+    for row in get_paths():
+        detail_ids.setdefault(row["cv_path"], []).append(row["detail_id"])
+
+    index = load_index(index_file)
+    manifest = load_manifest(manifest_file)
+    plan = plan_changes(pdfs, detail_ids, manifest, set(index.doc_ids))
+
+    if plan.empty:
+        return plan
+
+    updated = plan.added + plan.changed
+    jobs = [(plan.documents[cv_path]["detail_ids"], pdfs[cv_path]) for cv_path in updated]
+    rows = extract_clean_texts(jobs, text_cache, workers)
+
+    clean_texts = {}
+    path_of = {detail_id: cv_path for cv_path in updated for detail_id in plan.documents[cv_path]["detail_ids"]}
+    for detail_id, _, clean_text in rows:
+        clean_texts[path_of[detail_id]] = clean_text
+
+    for cv_path in plan.removed:
+        index.remove_document(cv_path)
+    for cv_path in updated:
+        index.remove_document(cv_path)
+        index.add_document(cv_path, clean_texts[cv_path])
+
+    root = os.path.dirname(os.path.abspath(data_dir))
+    for cv_path in plan.removed:
+        text_cache.forget(os.path.join(root, cv_path))
+    text_cache.flush()
+    if plan.changed or plan.removed:
+        text_cache.prune()
+
+    if update_db_text:
+        stale_ids = set()
+        for cv_path in plan.removed + plan.changed:
+            stale_ids.update(manifest.get(cv_path, {}).get("detail_ids", []))
+        stale_ids -= set(path_of)
+        create_text_table()
+        delete_cv_texts(sorted(stale_ids))
+        save_cv_texts(rows)
+
+    # The index is saved before the manifest, so an interrupted run is redone next time
+    if updated or plan.removed:
+        save_index(index, index_file)
+        if os.path.exists(corpus_file):
+            build_corpus(sorted(plan.documents), text_cache, corpus_file, root)
+            if os.path.exists(suffix_array_file):
+                with CorpusStore(corpus_file) as corpus:
+                    SuffixArray.build(corpus).save(suffix_array_file)
+    save_manifest(plan.documents, manifest_file)
+    return plan
+
+
+def load_index(index_file: str) -> InvertedIndex:
+    global _loaded_index
+    try:
+        mtime = os.stat(index_file).st_mtime_ns
+    except FileNotFoundError:
+        return InvertedIndex()
+
+    if _loaded_index is None or _loaded_index[:2] != (index_file, mtime):
+        _loaded_index = (index_file, mtime, InvertedIndex.load(index_file))
+    return _loaded_index[2]
+
+
+def save_index(index: InvertedIndex, index_file: str):
+    global _loaded_index
+    index.save(index_file)
+    _loaded_index = (index_file, os.stat(index_file).st_mtime_ns, index)
+
+
+def print_plan(plan: ReindexPlan, elapsed: float):
+    print(f"Added: {len(plan.added)}, changed: {len(plan.changed)}, removed: {len(plan.removed)}, "
+          f"touched: {len(plan.touched)} ({elapsed:.2f}s)")
+    for label, cv_paths in (("+", plan.added), ("~", plan.changed), ("-", plan.removed)):
+        for cv_path in cv_paths[:20]:
+            print(f"  {label} {cv_path}")
+        if len(cv_paths) > 20:
+            print(f"  {label} ... {len(cv_paths) - 20} more")
+
+
+def watch(interval: float, **kwargs):
+    """Poll the data directory and reindex whenever something changed; stops on Ctrl+C"""
+    text_cache = PDFTextCache()
+    print(f"Watching {kwargs.get('data_dir', DEFAULT_DATA_DIR)} every {interval}s (Ctrl+C to stop)")
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                plan = reindex(text_cache=text_cache, **kwargs)
+                if not plan.empty:
+                    print_plan(plan, time.perf_counter() - start)
+            except Exception as e:
+                # The cached index may be half updated; reload it from disk next time
+                global _loaded_index
+                _loaded_index = None
+                print(f"Error: {e}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    """Main function with command line interface"""
+    parser = argparse.ArgumentParser(description='Update the index, text cache and stored CV text for changed CVs only')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='Directory containing the CV PDF files')
+    parser.add_argument('--index', default=DEFAULT_INDEX_FILE, help='Inverted index file')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST_FILE, help='Manifest of indexed files')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS_FILE, help='Corpus store to rewrite when it exists')
+    parser.add_argument('--suffix-array', default=DEFAULT_SUFFIX_ARRAY_FILE, help='Suffix array to rebuild when it exists')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Extraction worker processes (default: all CPUs)')
+    parser.add_argument('--no-db-text', action='store_true', help='Do not update the ApplicationText table')
+    parser.add_argument('--watch', action='store_true', help='Keep polling the data directory for changes')
+    parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls in --watch mode')
+
+    args = parser.parse_args()
+    kwargs = dict(data_dir=args.data_dir, index_file=args.index, manifest_file=args.manifest,
+                  workers=args.workers, update_db_text=not args.no_db_text, corpus_file=args.corpus,
+                  suffix_array_file=args.suffix_array)
+
+    if args.watch:
+        watch(args.interval, **kwargs)
+        return 0
+
+    try:
+        start = time.perf_counter()
+        plan = reindex(**kwargs)
+        print_plan(plan, time.perf_counter() - start)
+        return 0
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
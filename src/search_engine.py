@@ -0,0 +1,533 @@
+import os
+import threading
+from contextlib import closing
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from aho_corasick import AhoCorasick
+from patterns import compile_pattern
+from text_cache import PDFTextCache
+from inverted_index import InvertedIndex, build_index, DEFAULT_INDEX_FILE
+from corpus_store import CorpusStore, build_corpus, code_points, DEFAULT_CORPUS_FILE
+from suffix_array import SuffixArray, DEFAULT_SUFFIX_ARRAY_FILE
+from db import get_paths, get_cv_texts
+from ranking import ScanResult, TopN, max_matches
+from tracing import StageTimes, merge_stages, stage, trace
+
+
+
+def parse_keywords(keywords: str) -> List[str]:
+    """Split the comma-separated keyword input into normalized keywords"""
+    return [kw.strip().lower() for kw in keywords.split(",")]
+
+
+def local_cv_path(cv_path: str) -> str:
+    """Path of a database cv_path relative to the src directory"""
+    return "..\\" + cv_path
+
+
+def match_document(content: str, keyword_list: List[str], algorithm: str,
+                   automaton: AhoCorasick = None) -> Tuple[int, List[Dict[str, int]], bool]:
+    """
+        Count every keyword in one document, falling back to fuzzy search for
+        keywords without an exact match
+
+        Returns:
+            (total matches, matched keywords with counts, whether fuzzy search was used)
+    """
+    algorithm = algorithm.upper()
+    doc_counts = None
+    if automaton is not None:
+        with stage("exact"):
+            doc_counts = automaton.count_all(content)
+
+    keyword_matches = []
+    total_matches = 0
+    fuzzy_used = False
+
+    for keyword in keyword_list:
+        if doc_counts is not None:
+            count = doc_counts.get(keyword, 0)
+        elif algorithm in ("KMP", "BM"):
+            with stage("exact"):
+                count = compile_pattern(keyword, algorithm).count(content)
+        else:
+            count = 0
+
+        if count == 0:
+            with stage("fuzzy"):
+                count = compile_pattern(keyword, "FUZZY").count(content)
+            fuzzy_used = True
+
+        if count > 0:
+            keyword_matches.append({"keyword": keyword, "count": count})
+            total_matches += count
+
+    return total_matches, keyword_matches, fuzzy_used
+
+
+def scan_texts(texts: Iterable[Tuple[int, str]], keyword_list: List[str], algorithm: str) -> List[ScanResult]:
+    """
+        Match (row index, clean text) documents. Only documents with at least
+        one match are returned.
+    """
+    automaton = compile_pattern(tuple(keyword_list), "AC") if algorithm.upper() == "AC" else None
+
+    results = []
+    for row_index, content in texts:
+        total_matches, keyword_matches, fuzzy_used = match_document(content, keyword_list, algorithm, automaton)
+        if total_matches > 0:
+            results.append((row_index, total_matches, keyword_matches, fuzzy_used))
+    return results
+
+
+def read_items(items: List[Tuple[int, Optional[str], Optional[str]]], text_cache: PDFTextCache) -> Iterator[Tuple[int, str]]:
+    """
+        Lazily resolve (row index, cv_path, clean text or None) work items to
+        (row index, clean text); missing text is read through the cache
+    """
+    for row_index, cv_path, content in items:
+        if content is not None:
+            yield row_index, content
+            continue
+        pdf_path = local_cv_path(cv_path)
+        with stage("stat"):
+            exists = os.path.isfile(pdf_path)
+        if exists:
+            yield row_index, text_cache.get_text(pdf_path, clean=True)
+
+
+def search_index(documents: List[Tuple[int, str]], keyword_list: List[str], index) -> List[ScanResult]:
+    """
+        Answer keyword counts for (row index, cv_path) documents from an
+        InvertedIndex instead of scanning their text
+    """
+    with stage("exact", calls=len(keyword_list)):
+        exact_counts = {keyword: index.count(keyword) for keyword in keyword_list}
+    fuzzy_counts = {}
+
+    results = []
+    for row_index, cv_path in documents:
+        if cv_path not in index.doc_ids:
+            continue
+
+        keyword_matches = []
+        total_matches = 0
+        fuzzy_used = False
+
+        for keyword in keyword_list:
+            count = exact_counts[keyword].get(cv_path, 0)
+            if count == 0:
+                # The vocabulary scan is done once per keyword, not once per document
+                if keyword not in fuzzy_counts:
+                    with stage("fuzzy"):
+                        fuzzy_counts[keyword] = index.fuzzy_count(keyword)
+                count = fuzzy_counts[keyword].get(cv_path, 0)
+                fuzzy_used = True
+
+            if count > 0:
+                keyword_matches.append({"keyword": keyword, "count": count})
+                total_matches += count
+
+        if total_matches > 0:
+            results.append((row_index, total_matches, keyword_matches, fuzzy_used))
+
+    return results
+
+
+def search_corpus(documents: List[Tuple[int, str]], keyword_list: List[str], algorithm: str,
+                  corpus: CorpusStore, suffix_array: SuffixArray = None) -> List[ScanResult]:
+    """
+        Count keywords for (row index, cv_path) documents with whole-corpus
+        scans of a CorpusStore: one sequential pass per keyword (one for all
+        keywords with AC) instead of one pass per document. With algorithm
+        SA the exact counts come from the suffix array instead.
+    """
+    algorithm = algorithm.upper()
+    with stage("exact", calls=len(keyword_list)):
+        if algorithm == "SA":
+            exact_counts = {keyword: suffix_array.count(keyword) for keyword in keyword_list}
+        elif algorithm == "AC":
+            automaton = compile_pattern(tuple(code_points(keyword) for keyword in keyword_list), "AC")
+            pattern_counts = corpus.count_all(automaton)
+            exact_counts = {keyword: pattern_counts.get(code_points(keyword), {}) for keyword in keyword_list}
+        elif algorithm in ("KMP", "BM"):
+            exact_counts = {keyword: corpus.count(compile_pattern(code_points(keyword), algorithm))
+                            for keyword in keyword_list}
+        else:
+            exact_counts = {}
+    fuzzy_counts = {}
+
+    results = []
+    for row_index, cv_path in documents:
+        if cv_path not in corpus.doc_numbers:
+            continue
+
+        keyword_matches = []
+        total_matches = 0
+        fuzzy_used = False
+
+        for keyword in keyword_list:
+            count = exact_counts.get(keyword, {}).get(cv_path, 0)
+            if count == 0:
+                # Like the exact scans, the fuzzy scan covers every document at once
+                if keyword not in fuzzy_counts:
+                    with stage("fuzzy"):
+                        fuzzy_counts[keyword] = corpus.count(compile_pattern(code_points(keyword), "FUZZY"))
+                count = fuzzy_counts[keyword].get(cv_path, 0)
+                fuzzy_used = True
+
+            if count > 0:
+                keyword_matches.append({"keyword": keyword, "count": count})
+                total_matches += count
+
+        if total_matches > 0:
+            results.append((row_index, total_matches, keyword_matches, fuzzy_used))
+
+    return results
+
+
+_worker_text_cache = None
+
+
+def _worker_cache() -> PDFTextCache:
+    # The cache (and its path index) lives as long as the pool worker
+    global _worker_text_cache
+    if _worker_text_cache is None:
+        _worker_text_cache = PDFTextCache()
+    return _worker_text_cache
+
+
+# Pool tasks return (results, stage times) so the caller can merge the times into its trace
+
+def _scan_item_chunk(items, keyword_list: List[str], algorithm: str) -> Tuple[List[ScanResult], StageTimes]:
+    text_cache = _worker_cache()
+    with trace("scan_chunk", record=False) as chunk_trace:
+        results = scan_texts(read_items(items, text_cache), keyword_list, algorithm)
+    text_cache.flush()
+    return results, chunk_trace.stages()
+
+
+class SearchPool:
+    """
+        Persistent process pool that scans CV documents in parallel.
+
+        The worker processes are started on the first search and reused by
+        every following search until shutdown() is called.
+    """
+
+    def __init__(self, workers: int = None, chunks_per_worker: int = 4):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Searches from several threads (e.g. server.py) share the one pool
+        self._executor_lock = threading.Lock()
+
+    def split(self, items: list) -> List[list]:
+        """
+            Split work into contiguous chunks; several chunks per worker keep
+            every core busy when documents differ in size
+        """
+        if not items:
+            return []
+        chunk_count = min(len(items), self.workers * self.chunks_per_worker)
+        chunk_size = -(-len(items) // chunk_count)
+        return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+    def iter_chunks(self, chunks: List[list], keyword_list: List[str],
+                    algorithm: str) -> Iterator[Tuple[int, List[ScanResult]]]:
+        """
+            Scan (row index, cv_path, clean text or None) chunks and yield
+            (chunk index, results) as each one completes. Chunks not started
+            yet are cancelled when the caller stops iterating.
+        """
+        futures = {self._submit(_scan_item_chunk, chunk, keyword_list, algorithm): chunk_index
+                   for chunk_index, chunk in enumerate(chunks)}
+        try:
+            for future in as_completed(futures):
+                results, stages = future.result()
+                merge_stages(stages)
+                yield futures[future], results
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _submit(self, func, chunk, keyword_list, algorithm) -> Future:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            executor = self._executor
+        return executor.submit(func, chunk, keyword_list, algorithm)
+
+    def shutdown(self):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def get_worker_count() -> int:
+    """
+        Number of search worker processes from SEARCH_WORKERS.
+        0 or 1 keeps scanning in the calling process; unset uses every CPU.
+    """
+    value = os.getenv("SEARCH_WORKERS")
+    if value is None or value.strip() == "":
+        return os.cpu_count() or 1
+    return max(0, int(value))
+
+
+# Values accepted for the algorithm argument of CVSearchService.search
+ALGORITHMS = ("KMP", "BM", "AC", "INDEX", "SA")
+
+
+class SearchCancelled(Exception):
+    """Raised when a running search is cancelled through its cancel event"""
+
+
+class CVSearchService:
+    """
+        Search state and logic shared by every front end (no PyQt here).
+
+        Holds the text cache, the inverted index, the corpus store and the
+        process pool so they stay warm between searches.
+    """
+
+    # Documents scanned between progress updates when scanning in-process
+    BATCH_SIZE = 50
+
+    def __init__(self, workers: int = None):
+        self.text_cache = PDFTextCache()
+        self.index = None
+        self._index_mtime = None
+        self.last_trace = None
+        self._index_lock = threading.Lock()
+        self.corpus = None
+        self._corpus_mtime = None
+        self._corpus_lock = threading.Lock()
+        self.suffix_array = None
+
+        # Scan in a persistent process pool unless SEARCH_WORKERS is 0 or 1
+        workers = get_worker_count() if workers is None else workers
+        self.pool = SearchPool(workers) if workers > 1 else None
+
+    def search(self, keywords: str, algorithm: str, top_n: int,
+               on_progress: Callable[[int, int], None] = None,
+               on_partial: Callable[[List[dict]], None] = None,
+               cancel_event: threading.Event = None) -> List[dict]:
+        """
+            Run a search and return the top_n results, best first.
+
+            on_progress(done, total) is called as documents are scanned and
+            on_partial(results) with the current top_n whenever it changes.
+            Setting cancel_event stops the search with SearchCancelled.
+
+            Only the best top_n results are ever kept. Documents are scanned
+            in order of their upper bound on matches, and the scan stops once
+            no remaining document could enter the top_n.
+
+            Every search is traced (see tracing.py); the last trace is kept
+            in last_trace.
+
+            Raises ValueError for an algorithm not in ALGORITHMS, since the
+            early-stop bounds only hold for those.
+        """
+        if algorithm.upper() not in ALGORITHMS:
+            raise ValueError(f"algorithm must be one of {', '.join(ALGORITHMS)}")
+        scope = trace("search", keywords=keywords, algorithm=algorithm, top_n=top_n)
+        try:
+            with scope as search_trace:
+                return self._search(keywords, algorithm, top_n, on_progress, on_partial,
+                                    cancel_event, search_trace)
+        finally:
+            self.last_trace = scope.trace.to_dict()
+
+    def _search(self, keywords, algorithm, top_n, on_progress, on_partial, cancel_event, search_trace) -> List[dict]:
+        rows = get_paths()
+        keyword_list = parse_keywords(keywords)
+        documents = [(row_index, row["cv_path"]) for row_index, row in enumerate(rows)]
+
+        top = TopN(top_n)
+        done = 0
+        scanned = 0
+        # closing() cancels queued pool chunks as soon as the search stops early
+        with closing(self._iter_batches(rows, documents, keyword_list, algorithm)) as batches:
+            for batch_size, batch, remaining_bound in batches:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise SearchCancelled()
+
+                done += batch_size
+                scanned += batch_size
+                with stage("ranking"):
+                    changed = top.push_all(batch)
+                    partial = self._format(rows, top.results()) if on_partial is not None and changed else None
+                if partial is not None:
+                    on_partial(partial)
+
+                if not top.can_improve(remaining_bound):
+                    done = len(documents)
+
+                if on_progress is not None:
+                    on_progress(done, len(documents))
+                if done == len(documents):
+                    break
+
+        search_trace.info.update(documents=len(documents), scanned=scanned)
+        with stage("ranking"):
+            return self._format(rows, top.results())
+
+    def _iter_batches(self, rows, documents, keyword_list, algorithm) -> Iterator[Tuple[int, List[ScanResult], float]]:
+        # Yield (documents done, results, upper bound on any document not scanned yet)
+        if algorithm.upper() == "INDEX":
+            yield len(documents), search_index(documents, keyword_list, self.get_index(rows)), 0
+            return
+
+        source = os.getenv("CV_TEXT_SOURCE", "file").lower()
+        if algorithm.upper() == "SA" or source == "corpus":
+            # Sequential scans of the memory-mapped corpus; no per-document work to batch
+            corpus = self.get_corpus(rows)
+            try:
+                suffix_array = self.get_suffix_array(corpus) if algorithm.upper() == "SA" else None
+                results = search_corpus(documents, keyword_list, algorithm, corpus, suffix_array)
+            finally:
+                corpus.release()
+            yield len(documents), results, 0
+            return
+
+        db_texts = {}
+        if source == "db":
+            # Text precomputed by ingest.py, read in one bulk query
+            db_texts = get_cv_texts()
+
+        # Work items (row index, cv_path, clean text or None), best possible score first;
+        # the sort is stable, so documents of unknown length keep row order at the front
+        self.text_cache.refresh()
+        score_bounds = self.get_score_bounds(rows, keyword_list)
+        items = []
+        with stage("stat", calls=len(documents)):
+            for row_index, cv_path in documents:
+                content = db_texts.get(rows[row_index]["detail_id"])
+                length = len(content) if content is not None else self.text_cache.get_length(local_cv_path(cv_path))
+                # The index bound only holds while the document still has the indexed text
+                indexed_length, bound = score_bounds.get(cv_path, (None, None))
+                if length is None or indexed_length != length:
+                    bound = max_matches(length, len(keyword_list))
+                items.append((bound, (row_index, cv_path, content)))
+        items.sort(key=lambda item: item[0], reverse=True)
+
+        if self.pool is not None:
+            chunks = self.pool.split(items)
+            pending = set(range(len(chunks)))
+            for chunk_index, results in self.pool.iter_chunks([[item for _, item in chunk] for chunk in chunks], keyword_list, algorithm):
+                pending.discard(chunk_index)
+                # Chunks are sorted by bound, so the first pending chunk bounds everything left
+                remaining_bound = chunks[min(pending)][0][0] if pending else 0
+                yield len(chunks[chunk_index]), results, remaining_bound
+            return
+
+        try:
+            for i in range(0, len(items), self.BATCH_SIZE):
+                batch = [item for _, item in items[i:i + self.BATCH_SIZE]]
+                results = scan_texts(read_items(batch, self.text_cache), keyword_list, algorithm)
+                remaining_bound = items[i + self.BATCH_SIZE][0] if i + self.BATCH_SIZE < len(items) else 0
+                yield len(batch), results, remaining_bound
+        finally:
+            self.text_cache.flush()
+
+    @staticmethod
+    def _format(rows, ranked: List[ScanResult]) -> List[dict]:
+        results = []
+        for row_index, total_matches, keyword_matches, fuzzy_used in ranked:
+            row = rows[row_index]
+            results.append({
+                "applicant_id" : row["applicant_id"],
+                "name": f"{row['first_name']} {row['last_name']}",
+                "matches": total_matches,
+                "keywords": keyword_matches,
+                "cv_path" : local_cv_path(row["cv_path"]),
+                "fuzzy" : fuzzy_used
+            })
+        return results
+
+    def get_index(self, rows):
+        """
+            Load the inverted index, building it from the given rows the first
+            time. The index is reloaded when the file changed on disk (e.g.
+            after reindex.py ran).
+        """
+        with self._index_lock:
+            try:
+                mtime = os.stat(DEFAULT_INDEX_FILE).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+
+            if self.index is None or (mtime is not None and mtime != self._index_mtime):
+                if mtime is not None:
+                    self.index = InvertedIndex.load(DEFAULT_INDEX_FILE)
+                else:
+                    self.index = build_index([row["cv_path"] for row in rows], self.text_cache)
+                    self.index.save(DEFAULT_INDEX_FILE)
+                    mtime = os.stat(DEFAULT_INDEX_FILE).st_mtime_ns
+                self._index_mtime = mtime
+            return self.index
+
+    def get_score_bounds(self, rows, keyword_list: List[str]) -> Dict[str, Tuple[int, int]]:
+        """
+            InvertedIndex.score_bounds of the saved index, or nothing when
+            there is no index yet (a scan never waits for one to be built)
+        """
+        if self.index is None and not os.path.exists(DEFAULT_INDEX_FILE):
+            return {}
+        with stage("bounds"):
+            return self.get_index(rows).score_bounds(keyword_list)
+
+    def get_corpus(self, rows) -> CorpusStore:
+        """
+            Open the corpus store, building it from the given rows the first
+            time. It is reopened when the file changed on disk (e.g. after
+            reindex.py rebuilt it).
+
+            The store is returned acquired; the caller must release it. A
+            replaced store is closed once the searches using it are done.
+        """
+        with self._corpus_lock:
+            try:
+                mtime = os.stat(DEFAULT_CORPUS_FILE).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+
+            if self.corpus is None or mtime != self._corpus_mtime:
+                if mtime is None:
+                    build_corpus([row["cv_path"] for row in rows], self.text_cache)
+                    mtime = os.stat(DEFAULT_CORPUS_FILE).st_mtime_ns
+                corpus = CorpusStore(DEFAULT_CORPUS_FILE)
+                if self.corpus is not None:
+                    self.corpus.retire()
+                self.corpus = corpus
+                self._corpus_mtime = mtime
+            return self.corpus.acquire()
+
+    def get_suffix_array(self, corpus: CorpusStore) -> SuffixArray:
+        """
+            Load the suffix array of an acquired corpus store, building and
+            saving it when there is none yet or the corpus changed since
+        """
+        with self._corpus_lock:
+            if corpus is not self.corpus:
+                # A search that started before the corpus was replaced; not worth keeping
+                return SuffixArray.build(corpus)
+            if self.suffix_array is None or self.suffix_array.corpus is not corpus:
+                try:
+                    self.suffix_array = SuffixArray.load(corpus, DEFAULT_SUFFIX_ARRAY_FILE)
+                except (FileNotFoundError, ValueError):
+                    self.suffix_array = SuffixArray.build(corpus)
+                    self.suffix_array.save(DEFAULT_SUFFIX_ARRAY_FILE)
+            return self.suffix_array
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+        self.suffix_array = None
+        if self.corpus is not None:
+            self.corpus.retire()
+            self.corpus = None
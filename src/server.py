@@ -0,0 +1,187 @@
+import sys
+import json
+import time
+import logging
+import argparse
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from cv_backend import CVBackend
+from search_engine import ALGORITHMS
+from tracing import setup_logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1 << 20
+
+
+class RequestError(Exception):
+    """A client error, answered with its HTTP status and message"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class CVRequestHandler(BaseHTTPRequestHandler):
+    """
+        JSON API over the CVBackend of the server:
+
+            GET  /health
+            GET  /search?keywords=python,sql&algorithm=KMP&top_n=10
+            POST /search   {"keywords": "python, sql", "algorithm": "KMP", "top_n": 10}
+            GET  /summary?cv_path=<cv_path of a search result>
+            GET  /stats
+            GET  /traces?limit=20
+
+        Every request runs in its own thread against the shared backend.
+    """
+
+    server_version = "JuliusCV"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        self._dispatch(url.path, params)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        try:
+            params = self._read_json()
+        except RequestError as e:
+            self._send_json(e.status, {"error": str(e)})
+            return
+        self._dispatch(url.path, params)
+
+    def _dispatch(self, path: str, params: dict):
+        routes = {
+            "/health": self.health,
+            "/search": self.search,
+            "/summary": self.summary,
+            "/stats": self.stats,
+            "/traces": self.traces,
+        }
+        handler = routes.get(path.rstrip("/") or "/")
+        try:
+            if handler is None:
+                raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown endpoint: {path}")
+            self._send_json(HTTPStatus.OK, handler(params))
+        except RequestError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except (LookupError, FileNotFoundError) as e:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": str(e)})
+        except Exception as e:
+            logger.exception("%s %s failed", self.command, path)
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+
+    def health(self, params: dict) -> dict:
+        return {"status": "ok"}
+
+    def search(self, params: dict) -> dict:
+        keywords = params.get("keywords")
+        if not isinstance(keywords, str) or not keywords.strip():
+            raise RequestError(HTTPStatus.BAD_REQUEST, "keywords is required")
+
+        algorithm = str(params.get("algorithm", "KMP")).upper()
+        if algorithm not in ALGORITHMS:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"algorithm must be one of {', '.join(ALGORITHMS)}")
+
+        top_n = _positive_int(params.get("top_n", 10), "top_n")
+
+        start = time.perf_counter()
+        results = self.server.backend.search(keywords, algorithm, top_n)
+        return {"results": results, "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)}
+
+    def summary(self, params: dict) -> dict:
+        cv_path = params.get("cv_path")
+        if not isinstance(cv_path, str) or not cv_path:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "cv_path is required")
+        return self.server.backend.get_cv_summary(cv_path)
+
+    def stats(self, params: dict) -> dict:
+        backend = self.server.backend
+        return {"db": backend.get_db_stats(), "summaries": backend.summaries.stats()}
+
+    def traces(self, params: dict) -> dict:
+        limit = _positive_int(params["limit"], "limit") if "limit" in params else None
+        return {"traces": self.server.backend.get_search_traces(limit)}
+
+    def _read_json(self) -> dict:
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+
+        body = self.rfile.read(length) if length else b"{}"
+        try:
+            params = json.loads(body)
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Request body is not valid JSON")
+        if not isinstance(params, dict):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+        return params
+
+    def _send_json(self, status: HTTPStatus, payload: dict):
+        # default=str covers dates and other non-JSON values from the database
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+def _positive_int(value, name: str) -> int:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer")
+    if number < 1:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"{name} must be at least 1")
+    return number
+
+
+class CVServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer holding the one CVBackend every request thread shares"""
+
+    daemon_threads = True
+
+    def __init__(self, address, backend: CVBackend):
+        super().__init__(address, CVRequestHandler)
+        self.backend = backend
+
+
+def main():
+    """Main function with command line interface"""
+    parser = argparse.ArgumentParser(description='Serve CV search and summaries as a local JSON API (no GUI)')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='Address to bind (default: localhost only)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Search worker processes (default: SEARCH_WORKERS)')
+    args = parser.parse_args()
+
+    setup_logging()
+    backend = CVBackend(args.workers)
+    server = CVServer((args.host, args.port), backend)
+    print(f"Serving on http://{args.host}:{server.server_port} (Ctrl+C to stop)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        backend.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
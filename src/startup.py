@@ -0,0 +1,76 @@
+import sys
+import time
+import threading
+from typing import Iterable, List, Tuple
+
+# Startup times are measured from the first import of this module, which
+# main.py does before anything heavy (interpreter start-up itself is not included)
+_START = time.perf_counter()
+
+_lock = threading.Lock()
+_enabled = False
+_expected = set()
+_reported = False
+# (name, ms since start, duration ms or None) in the order they happened
+_events: List[Tuple[str, float, float]] = []
+
+
+def enable(expected: Iterable[str] = ()):
+    """
+        Record startup events from now on (--profile-startup) and print the
+        report once every milestone in expected has been marked
+    """
+    global _enabled, _expected
+    with _lock:
+        _enabled = True
+        _expected = set(expected)
+
+
+def mark(name: str):
+    """Record that a startup milestone was reached, such as the first paint"""
+    _record(name, None)
+
+
+class _Timed:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _record(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+def timed(name: str) -> _Timed:
+    """Context manager recording how long a startup step took, e.g. a group of imports"""
+    return _Timed(name)
+
+
+def _record(name: str, duration_ms):
+    global _reported
+    if not _enabled:
+        return
+    with _lock:
+        _events.append((name, (time.perf_counter() - _START) * 1000, duration_ms))
+        seen = {event[0] for event in _events}
+        done = not _reported and _expected <= seen
+        if done:
+            _reported = True
+    if done:
+        print(format_report(), file=sys.stderr, flush=True)
+
+
+def format_report() -> str:
+    with _lock:
+        events = list(_events)
+    lines = ["Startup profile (ms since launch):"]
+    for name, at_ms, duration_ms in events:
+        took = f"  (took {duration_ms:.1f} ms)" if duration_ms is not None else ""
+        lines.append(f"  {at_ms:>9.1f}  {name}{took}")
+    lines.append("  Per-module import times: python -X importtime main.py")
+    return "\n".join(lines)
@@ -0,0 +1,239 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+
+DEFAULT_SQLITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "juliuscv.sqlite3")
+
+
+class MySQLStorage:
+    """
+        MySQL server backend. Connections come from one pool per process and
+        have the database selected when they are opened.
+    """
+
+    name = "mysql"
+    param = "%s"
+
+    schema = [
+        """
+        CREATE TABLE IF NOT EXISTS ApplicantProfile (
+            applicant_id INT AUTO_INCREMENT PRIMARY KEY,
+            first_name VARCHAR(50),
+            last_name VARCHAR(50),
+            date_of_birth DATE,
+            address VARCHAR(255),
+            phone_number VARCHAR(20)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS ApplicationDetail (
+            detail_id INT AUTO_INCREMENT PRIMARY KEY,
+            applicant_id INT NOT NULL,
+            application_role VARCHAR(100),
+            cv_path VARCHAR(255),
+            INDEX idx_detail_cv_path (cv_path),
+            FOREIGN KEY (applicant_id) REFERENCES ApplicantProfile(applicant_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+        """,
+    ]
+
+    text_table_sql = """
+        CREATE TABLE IF NOT EXISTS ApplicationText (
+            detail_id INT PRIMARY KEY,
+            raw_text MEDIUMTEXT,
+            clean_text MEDIUMTEXT,
+            FOREIGN KEY (detail_id) REFERENCES ApplicationDetail(detail_id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+    """
+
+    table_exists_sql = """
+        SELECT COUNT(*) FROM information_schema.tables
+        WHERE table_schema = DATABASE() AND LOWER(table_name) = LOWER(%s)
+    """
+
+    upsert_text_sql = """
+        INSERT INTO ApplicationText (detail_id, raw_text, clean_text) VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE raw_text = VALUES(raw_text), clean_text = VALUES(clean_text)
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def get_connection_pool(self):
+        from mysql.connector import pooling
+
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = pooling.MySQLConnectionPool(
+                    pool_name="juliuscv",
+                    pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+                    pool_reset_session=False,
+                    host=os.getenv("DB_HOST"),
+                    user=os.getenv("DB_USER"),
+                    password=os.getenv("DB_PASSWORD"),
+                    database=os.getenv("DB_NAME")
+                )
+        return self._pool
+
+    def get_pooled_connection(self, timeout=None):
+        # Wait for a free connection instead of failing when a burst exhausts the pool
+        from mysql.connector.errors import PoolError
+
+        if timeout is None:
+            timeout = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+        deadline = time.monotonic() + timeout
+
+        while True:
+            try:
+                return self.get_connection_pool().get_connection()
+            except PoolError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.01)
+
+    @contextmanager
+    def connection(self):
+        connection = self.get_pooled_connection()
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def admin_connection(self):
+        # The database may not exist yet, so this one is opened outside the pool
+        import mysql.connector
+
+        connection = mysql.connector.connect(
+            host=os.getenv("DB_HOST"),
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD")
+        )
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {os.getenv('DB_NAME')}")
+            cursor.execute(f"USE {os.getenv('DB_NAME')}")
+            cursor.close()
+            yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def cursor(connection, dictionary=True):
+        return connection.cursor(dictionary=dictionary)
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+# Parse DATE columns into datetime.date like mysql.connector does
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+
+
+class SQLiteStorage:
+    """
+        Embedded SQLite backend in a single file, for running the app and load
+        tests without a MySQL server. Each thread keeps its own connection;
+        WAL mode lets readers run while ingest is writing.
+    """
+
+    name = "sqlite"
+    param = "?"
+
+    schema = [
+        """
+        CREATE TABLE IF NOT EXISTS ApplicantProfile (
+            applicant_id INTEGER PRIMARY KEY,
+            first_name VARCHAR(50),
+            last_name VARCHAR(50),
+            date_of_birth DATE,
+            address VARCHAR(255),
+            phone_number VARCHAR(20)
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS ApplicationDetail (
+            detail_id INTEGER PRIMARY KEY,
+            applicant_id INTEGER NOT NULL,
+            application_role VARCHAR(100),
+            cv_path TEXT,
+            FOREIGN KEY (applicant_id) REFERENCES ApplicantProfile(applicant_id)
+        );
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_detail_cv_path ON ApplicationDetail(cv_path);",
+        "CREATE INDEX IF NOT EXISTS idx_detail_applicant_id ON ApplicationDetail(applicant_id);",
+    ]
+
+    text_table_sql = """
+        CREATE TABLE IF NOT EXISTS ApplicationText (
+            detail_id INTEGER PRIMARY KEY,
+            raw_text TEXT,
+            clean_text TEXT,
+            FOREIGN KEY (detail_id) REFERENCES ApplicationDetail(detail_id) ON DELETE CASCADE
+        );
+    """
+
+    table_exists_sql = "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ? COLLATE NOCASE"
+
+    upsert_text_sql = """
+        INSERT INTO ApplicationText (detail_id, raw_text, clean_text) VALUES (?, ?, ?)
+        ON CONFLICT (detail_id) DO UPDATE SET raw_text = excluded.raw_text, clean_text = excluded.clean_text
+    """
+
+    def __init__(self, path=None):
+        self.path = os.path.abspath(path or os.getenv("SQLITE_PATH") or DEFAULT_SQLITE_PATH)
+        self._local = threading.local()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, detect_types=sqlite3.PARSE_DECLTYPES)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        return connection
+
+    @contextmanager
+    def connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        try:
+            yield connection
+        except BaseException:
+            connection.rollback()
+            raise
+
+    def admin_connection(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        return self.connection()
+
+    @staticmethod
+    def cursor(connection, dictionary=True):
+        cursor = connection.cursor()
+        if dictionary:
+            cursor.row_factory = _dict_row
+        return cursor
+
+
+BACKENDS = {
+    MySQLStorage.name: MySQLStorage,
+    SQLiteStorage.name: SQLiteStorage,
+}
+
+_storage = None
+_storage_lock = threading.Lock()
+
+def get_storage():
+    # The backend is picked once per process from DB_BACKEND (mysql or sqlite)
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            name = os.getenv("DB_BACKEND", "mysql").strip().lower() or "mysql"
+            if name not in BACKENDS:
+                raise ValueError(f"Unknown DB_BACKEND: {name} (expected one of {', '.join(BACKENDS)})")
+            _storage = BACKENDS[name]()
+    return _storage
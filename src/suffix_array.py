@@ -0,0 +1,179 @@
+import os
+import time
+import argparse
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from corpus_store import CorpusStore, DEFAULT_CORPUS_FILE, code_points
+
+DEFAULT_SUFFIX_ARRAY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "suffix_array.npz")
+SUFFIX_ARRAY_VERSION = 1
+
+_CODE_TYPES = {1: np.uint8, 2: np.uint16, 4: np.uint32}
+
+
+class SuffixArray:
+    """
+        Suffix array over the text of a CorpusStore, for exact substring
+        counts: "sql" is also found inside "mysql", as kmp_search finds it,
+        which the word-level InvertedIndex cannot answer.
+
+        Every occurrence of a pattern starts one suffix, and those suffixes
+        are adjacent in sorted order, so count and locate are two binary
+        searches of O(m log n) character comparisons plus a mapping of the
+        matched positions to their documents.
+    """
+
+    def __init__(self, corpus: CorpusStore, suffixes: np.ndarray):
+        self.corpus = corpus
+        self.suffixes = suffixes
+        self._offsets = np.array(corpus.offsets, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.suffixes)
+
+    @classmethod
+    def build(cls, corpus: CorpusStore) -> "SuffixArray":
+        """Sort every suffix of the corpus by prefix doubling"""
+        codes = np.frombuffer(corpus.buffer, dtype=_CODE_TYPES[corpus.width]).astype(np.int64)
+        return cls(corpus, sort_suffixes(codes))
+
+    def _bounds(self, pattern: List[int]) -> Tuple[int, int]:
+        # [lo, hi) of the suffixes starting with pattern; a suffix shorter
+        # than the pattern compares like its prefix, as list comparison does
+        buffer = self.corpus.buffer
+        suffixes = self.suffixes
+        m = len(pattern)
+
+        lo, hi = 0, len(suffixes)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = int(suffixes[mid])
+            if buffer[start:start + m].tolist() < pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        first = lo
+
+        hi = len(suffixes)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = int(suffixes[mid])
+            if buffer[start:start + m].tolist() <= pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        return first, lo
+
+    def _positions(self, keyword: str) -> np.ndarray:
+        pattern = list(code_points(keyword))
+        if not pattern:
+            return self.suffixes[:0]
+        lo, hi = self._bounds(pattern)
+        return self.suffixes[lo:hi]
+
+    def occurrences(self, keyword: str) -> int:
+        """Number of (possibly overlapping) occurrences in the whole corpus"""
+        pattern = list(code_points(keyword))
+        if not pattern:
+            return 0
+        lo, hi = self._bounds(pattern)
+        return hi - lo
+
+    def count(self, keyword: str) -> Dict[str, int]:
+        """
+            Occurrences of keyword per doc id, counted like kmp_search counts
+            them in each document (overlapping)
+        """
+        docs = np.searchsorted(self._offsets, self._positions(keyword), side="right") - 1
+        doc_numbers, counts = np.unique(docs, return_counts=True)
+        doc_ids = self.corpus.doc_ids
+        return {doc_ids[doc]: int(n) for doc, n in zip(doc_numbers.tolist(), counts.tolist())}
+
+    def locate(self, keyword: str) -> Dict[str, List[int]]:
+        """Start index of every occurrence of keyword, per doc id, in text order"""
+        positions = np.sort(self._positions(keyword))
+        docs = np.searchsorted(self._offsets, positions, side="right") - 1
+        doc_ids = self.corpus.doc_ids
+
+        located = {}
+        for doc, position in zip(docs.tolist(), (positions - self._offsets[docs]).tolist()):
+            located.setdefault(doc_ids[doc], []).append(position)
+        return located
+
+    def save(self, suffix_array_file: str = DEFAULT_SUFFIX_ARRAY_FILE):
+        os.makedirs(os.path.dirname(os.path.abspath(suffix_array_file)), exist_ok=True)
+        tmp_file = f"{suffix_array_file}.tmp"
+        with open(tmp_file, "wb") as f:
+            np.savez(f, suffixes=self.suffixes,
+                     meta=np.array([SUFFIX_ARRAY_VERSION, self.corpus.mtime, self.corpus.size], dtype=np.int64))
+        os.replace(tmp_file, suffix_array_file)
+
+    @classmethod
+    def load(cls, corpus: CorpusStore, suffix_array_file: str = DEFAULT_SUFFIX_ARRAY_FILE) -> "SuffixArray":
+        """Load a saved suffix array; ValueError when it was built over another version of the corpus"""
+        with np.load(suffix_array_file) as data:
+            version, corpus_mtime, corpus_size = data["meta"].tolist()
+            if version != SUFFIX_ARRAY_VERSION or corpus_mtime != corpus.mtime or corpus_size != corpus.size:
+                raise ValueError(f"Suffix array does not match the corpus: {suffix_array_file}")
+            return cls(corpus, data["suffixes"])
+
+
+def sort_suffixes(codes: np.ndarray) -> np.ndarray:
+    """
+        Suffix array of a sequence of code points: suffixes are ranked by
+        their first k characters, then by 2k (the rank pair of i and i + k),
+        until every rank is distinct. A suffix that ends first sorts first.
+    """
+    n = len(codes)
+    if n == 0:
+        return np.zeros(0, dtype=np.int32)
+
+    _, rank = np.unique(codes, return_inverse=True)
+    rank = rank.astype(np.int64)
+    k = 1
+    while True:
+        # Rank of the suffix k characters on, 0 past the end (real ranks start at 1)
+        following = np.zeros(n, dtype=np.int64)
+        following[:n - k] = rank[k:] + 1
+        keys = rank * (n + 1) + following
+        suffixes = np.argsort(keys)
+
+        sorted_keys = keys[suffixes]
+        new_rank = np.empty(n, dtype=np.int64)
+        new_rank[suffixes] = np.concatenate(([0], np.cumsum(sorted_keys[1:] != sorted_keys[:-1])))
+        rank = new_rank
+
+        if rank.max() == n - 1 or k >= n:
+            return suffixes.astype(np.int32)
+        k *= 2
+
+
+def main():
+    """Build the suffix array over the corpus store, writing the corpus first when it is missing"""
+    parser = argparse.ArgumentParser(description='Build the suffix array for substring counts over all CVs')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS_FILE, help='Corpus store to index')
+    parser.add_argument('-o', '--output', default=DEFAULT_SUFFIX_ARRAY_FILE, help='Suffix array file to write')
+    parser.add_argument('--base-dir', default='..', help='Directory the database cv_path values are relative to')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.corpus):
+        from corpus_store import build_corpus
+        from db import get_paths
+        from text_cache import PDFTextCache
+
+        build_corpus([row["cv_path"] for row in get_paths()], PDFTextCache(), args.corpus, args.base_dir)
+
+    with CorpusStore(args.corpus) as corpus:
+        start = time.perf_counter()
+        suffix_array = SuffixArray.build(corpus)
+        suffix_array.save(args.output)
+        elapsed = time.perf_counter() - start
+        print(f"Sorted {len(suffix_array)} suffixes of {len(corpus)} documents in {elapsed:.2f}s")
+
+    print(f"Suffix array saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
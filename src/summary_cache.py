@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Optional
+
+from regex import CVInfo
+from text_cache import file_hash
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "summaries")
+DEFAULT_MEMORY_BYTES = 16 * 1024 * 1024
+
+# Bump when the regex extraction changes so stale summaries are not served
+SUMMARY_VERSION = 1
+
+
+class CVSummaryCache:
+    """
+        Two-tier cache of the CVInfo extracted from each PDF.
+
+        Entries are keyed by the PDF engine of the processor and the PDF
+        content hash, which the text cache revalidates against the file size
+        and mtime, so an edited PDF is extracted again. The memory tier keeps
+        serialized entries in LRU order up to max_bytes; the disk tier keeps
+        one JSON file per PDF.
+
+        raw_text is not stored (the text cache already holds it), so cached
+        CVInfo objects have an empty raw_text.
+    """
+
+    def __init__(self, processor, cache_dir: str = None, max_bytes: int = DEFAULT_MEMORY_BYTES):
+        self.processor = processor
+        self.cache_dir = os.path.abspath(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, pdf_path: str) -> CVInfo:
+        """
+            CVInfo of a PDF, running the extraction pipeline only on a miss
+        """
+        key = self._key(pdf_path)
+
+        # Counters are shared by every thread using the cache (e.g. server.py), so they change under the lock
+        data = self._get_memory(key)
+        if data is None:
+            data = self._read_disk(key)
+            if data is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._put_memory(key, data)
+
+        if data is None:
+            with self._lock:
+                self.misses += 1
+            cv_info = self.processor.process_pdf(pdf_path, save_files=False)
+            data = self._serialize(cv_info)
+            self._write_disk(key, data)
+            self._put_memory(key, data)
+
+        return CVInfo(**json.loads(data))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def _key(self, pdf_path: str) -> str:
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+
+        text_cache = getattr(self.processor, "text_cache", None)
+        digest = text_cache.get_hash(pdf_path) if text_cache is not None else file_hash(pdf_path)
+        return f"{digest}.{self.processor.pdf_extractor.engine}.v{SUMMARY_VERSION}"
+
+    @staticmethod
+    def _serialize(cv_info: CVInfo) -> str:
+        data = asdict(cv_info)
+        data["raw_text"] = ""
+        return json.dumps(data)
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+            return data
+
+    def _put_memory(self, key: str, data: str):
+        size = len(data)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+
+            self._memory[key] = data
+            self._memory_bytes += size
+
+            # Evict least recently used entries until the total size fits
+            while self._memory_bytes > self.max_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        try:
+            with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key: str, data: str):
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from pdf_extractor import PDFTextExtractor
+from pdf_engines import match_engine
+from tracing import stage
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "text")
+
+# Blobs written this recently are never pruned: another process (a search
+# worker, reindex --watch) may have stored them without flushing its index yet
+PRUNE_GRACE_SECONDS = 3600
+
+
+class PDFTextCache:
+    """
+        Content-addressed on-disk cache of extracted PDF text.
+
+        Every PDF is identified by the SHA-1 of its bytes, so identical files
+        share one entry. A path index (path -> size, mtime, hash, clean text
+        length per engine) lets a warm lookup skip both hashing and extraction.
+
+        Cached text is also keyed by the extractor's PDF engine, so caches for
+        different engines can share one directory. The default extractor uses
+        the matching engine (see pdf_engines.match_engine).
+    """
+
+    def __init__(self, cache_dir: str = None, extractor: PDFTextExtractor = None):
+        self.cache_dir = os.path.abspath(cache_dir or DEFAULT_CACHE_DIR)
+        self.blob_dir = os.path.join(self.cache_dir, "blobs")
+        self.index_file = os.path.join(self.cache_dir, "index.json")
+        self.extractor = extractor or PDFTextExtractor(match_engine())
+        self.engine = self.extractor.engine
+
+        self._lock = threading.Lock()
+        self._index = None
+        self._dirty = {}
+        self._forgotten = set()
+
+    def get_text(self, pdf_path: str, clean: bool = True) -> str:
+        """
+            Return the raw or clean text of a PDF, extracting it only on a cache miss
+        """
+        raw_text, clean_text = self.get_texts(pdf_path, clean_only=clean)
+        return clean_text if clean else raw_text
+
+    def get_texts(self, pdf_path: str, clean_only: bool = False) -> Tuple[Optional[str], str]:
+        """
+            Return (raw_text, clean_text) of a PDF. With clean_only=True the raw
+            text is not read from disk and None is returned in its place.
+        """
+        with stage("stat"):
+            digest = self.get_hash(pdf_path)
+            raw_file, clean_file = self._blob_paths(digest)
+            cached = os.path.exists(clean_file) and os.path.exists(raw_file)
+
+        if not cached:
+            with stage("extraction"):
+                raw_text = self.extractor.extract_text(pdf_path, clean=False)
+            with stage("normalization"):
+                clean_text = self.extractor.clean_text(raw_text)
+            self._store(digest, raw_text, clean_text)
+            self._set_length(pdf_path, len(clean_text))
+            return raw_text, clean_text
+
+        with stage("cache_read"):
+            clean_text = self._read(clean_file)
+            raw_text = None if clean_only else self._read(raw_file)
+        self._set_length(pdf_path, len(clean_text))
+        return raw_text, clean_text
+
+    def get_length(self, pdf_path: str) -> Optional[int]:
+        """
+            Length of the cached clean text, or None when it is not known yet
+            or the file changed since it was cached
+        """
+        try:
+            stat = os.stat(pdf_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._load_index().get(self._key(pdf_path))
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+            return entry.get("lengths", {}).get(self.engine)
+        return None
+
+    def _set_length(self, pdf_path: str, length: int):
+        key = self._key(pdf_path)
+        with self._lock:
+            entry = self._load_index().get(key)
+            if entry is not None and entry.get("lengths", {}).get(self.engine) != length:
+                entry = dict(entry, lengths=dict(entry.get("lengths", {}), **{self.engine: length}))
+                self._index[key] = entry
+                self._dirty[key] = entry
+
+    def get_hash(self, pdf_path: str) -> str:
+        """
+            Return the content hash of a PDF, reusing the indexed hash while the
+            file size and mtime are unchanged
+        """
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+
+        key = self._key(pdf_path)
+        stat = os.stat(pdf_path)
+
+        with self._lock:
+            entry = self._load_index().get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+            return entry["hash"]
+
+        digest = file_hash(pdf_path)
+        entry = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": digest}
+        with self._lock:
+            self._index[key] = entry
+            self._dirty[key] = entry
+            self._forgotten.discard(key)
+        return digest
+
+    def forget(self, pdf_path: str):
+        """
+            Drop the index entry of a removed PDF on the next flush. Its text
+            stays on disk until prune() finds nothing referring to it.
+        """
+        key = self._key(pdf_path)
+        with self._lock:
+            self._load_index().pop(key, None)
+            self._dirty.pop(key, None)
+            self._forgotten.add(key)
+
+    def prune(self, grace: float = PRUNE_GRACE_SECONDS) -> int:
+        """
+            Delete cached text that no indexed path refers to anymore and
+            return the number of PDFs it belonged to.
+
+            Only this process's unflushed entries are known here, so blobs
+            modified after the index was last written, or within the last
+            grace seconds, are kept: they may belong to entries another
+            process has not flushed yet.
+        """
+        self.flush()
+        with self._lock:
+            try:
+                index_mtime = os.stat(self.index_file).st_mtime
+            except FileNotFoundError:
+                index_mtime = 0.0
+            referenced = {entry["hash"] for entry in self._read_index().values()}
+            referenced.update(entry["hash"] for entry in self._dirty.values())
+        cutoff = min(index_mtime, time.time() - grace)
+
+        removed = set()
+        for dirpath, _, filenames in os.walk(self.blob_dir):
+            for filename in filenames:
+                digest = filename.split(".", 1)[0]
+                if digest in referenced:
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    if os.stat(path).st_mtime >= cutoff:
+                        continue
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                removed.add(digest)
+        return len(removed)
+
+    def flush(self):
+        """
+            Persist new index entries. Entries written by other processes since
+            the index was loaded are kept.
+        """
+        with self._lock:
+            if not self._dirty and not self._forgotten:
+                return
+
+            index = self._read_index()
+            index.update(self._dirty)
+            for key in self._forgotten:
+                index.pop(key, None)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._write_atomic(self.index_file, json.dumps(index))
+
+            self._index = index
+            self._dirty = {}
+            self._forgotten = set()
+
+    def refresh(self):
+        """
+            Re-read the path index to pick up entries flushed by other
+            processes, keeping entries not flushed yet
+        """
+        with self._lock:
+            index = self._read_index()
+            index.update(self._dirty)
+            for key in self._forgotten:
+                index.pop(key, None)
+            self._index = index
+
+    def _load_index(self) -> Dict[str, dict]:
+        if self._index is None:
+            self._index = self._read_index()
+        return self._index
+
+    def _read_index(self) -> Dict[str, dict]:
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _store(self, digest: str, raw_text: str, clean_text: str):
+        os.makedirs(os.path.join(self.blob_dir, digest[:2]), exist_ok=True)
+        raw_file, clean_file = self._blob_paths(digest)
+        self._write_atomic(raw_file, raw_text)
+        self._write_atomic(clean_file, clean_text)
+
+    def _blob_paths(self, digest: str) -> Tuple[str, str]:
+        prefix = os.path.join(self.blob_dir, digest[:2], f"{digest}.{self.engine}")
+        return f"{prefix}.raw.txt", f"{prefix}.clean.txt"
+
+    @staticmethod
+    def _key(pdf_path: str) -> str:
+        return os.path.normcase(os.path.abspath(pdf_path))
+
+    @staticmethod
+    def _read(path: str) -> str:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    @staticmethod
+    def _write_atomic(path: str, content: str):
+        # Write to a temporary file first so readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+def file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+        SHA-1 of a file's content
+    """
+    sha = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
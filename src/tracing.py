@@ -0,0 +1,198 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages in the order a search goes through them
+STAGES = ("db_fetch", "bounds", "stat", "cache_read", "extraction", "normalization", "exact", "fuzzy", "ranking")
+
+# (seconds, calls) per stage, as returned by Trace.stages()
+StageTimes = Dict[str, Tuple[float, int]]
+
+_RECENT_TRACES = 100
+_recent = deque(maxlen=_RECENT_TRACES)
+_recent_lock = threading.Lock()
+_log_lock = threading.Lock()
+_local = threading.local()
+
+
+class Trace:
+    """
+        Time and call count per pipeline stage for one query.
+
+        Stages timed in search worker processes are merged in, so with a
+        process pool the stage times add up to more than the wall time.
+    """
+
+    def __init__(self, name: str, **info):
+        self.name = name
+        self.info = info
+        self.status = "ok"
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.elapsed = None
+        self._seconds: Dict[str, float] = {}
+        self._calls: Dict[str, int] = {}
+
+    def add(self, stage: str, seconds: float, calls: int = 1):
+        self._seconds[stage] = self._seconds.get(stage, 0.0) + seconds
+        self._calls[stage] = self._calls.get(stage, 0) + calls
+
+    def merge(self, stages: StageTimes):
+        for stage, (seconds, calls) in stages.items():
+            self.add(stage, seconds, calls)
+
+    def stages(self) -> StageTimes:
+        return {stage: (self._seconds[stage], self._calls[stage]) for stage in self._seconds}
+
+    def finish(self):
+        if self.elapsed is None:
+            self.elapsed = time.perf_counter() - self._start
+
+    def to_dict(self) -> dict:
+        known = [stage for stage in STAGES if stage in self._seconds]
+        other = sorted(stage for stage in self._seconds if stage not in STAGES)
+        return {
+            "name": self.name,
+            **self.info,
+            "status": self.status,
+            "started": self.started,
+            "elapsed_ms": round((self.elapsed or 0.0) * 1000, 3),
+            "stages": {
+                stage: {"ms": round(self._seconds[stage] * 1000, 3), "calls": self._calls[stage]}
+                for stage in known + other
+            },
+        }
+
+
+class _Stage:
+    # A class instead of @contextmanager: stages wrap per-document work, so entering one must be cheap
+    __slots__ = ("trace", "name", "calls", "start")
+
+    def __init__(self, trace: Trace, name: str, calls: int):
+        self.trace = trace
+        self.name = name
+        self.calls = calls
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.trace.add(self.name, time.perf_counter() - self.start, self.calls)
+        return False
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+def current_trace() -> Optional[Trace]:
+    """The trace active in this thread, or None"""
+    return getattr(_local, "trace", None)
+
+
+def stage(name: str, calls: int = 1):
+    """
+        Context manager timing one stage of the active trace; does nothing
+        when no trace is active
+    """
+    trace = getattr(_local, "trace", None)
+    if trace is None:
+        return _NO_STAGE
+    return _Stage(trace, name, calls)
+
+
+def add_stage(name: str, seconds: float, calls: int = 1):
+    """Add an already measured duration to the active trace, if any"""
+    trace = getattr(_local, "trace", None)
+    if trace is not None:
+        trace.add(name, seconds, calls)
+
+
+def merge_stages(stages: StageTimes):
+    """Merge stage times measured elsewhere (e.g. in a worker process) into the active trace"""
+    trace = getattr(_local, "trace", None)
+    if trace is not None and stages:
+        trace.merge(stages)
+
+
+class _TraceScope:
+    def __init__(self, name: str, record: bool = True, **info):
+        self.trace = Trace(name, **info)
+        self.record = record
+        self._previous = None
+
+    def __enter__(self) -> Trace:
+        self._previous = getattr(_local, "trace", None)
+        _local.trace = self.trace
+        return self.trace
+
+    def __exit__(self, exc_type, exc, tb):
+        _local.trace = self._previous
+        self.trace.finish()
+        if exc_type is not None:
+            self.trace.status = exc_type.__name__
+        if self.record:
+            _record(self.trace.to_dict())
+        return False
+
+
+def trace(name: str, record: bool = True, **info) -> _TraceScope:
+    """
+        Activate a new Trace for the current thread:
+
+            with trace("search", algorithm="KMP") as t:
+                ...
+
+        On exit the trace is finished and, when record is True, kept in the
+        recent traces, logged at DEBUG and appended to TRACE_LOG (JSON lines)
+        when that is set.
+    """
+    return _TraceScope(name, record, **info)
+
+
+def _record(entry: dict):
+    with _recent_lock:
+        _recent.append(entry)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        stages = ", ".join(f"{name} {value['ms']} ms/{value['calls']}" for name, value in entry["stages"].items())
+        logger.debug("%s %s in %s ms: %s", entry["name"], entry["status"], entry["elapsed_ms"], stages)
+
+    log_file = os.getenv("TRACE_LOG")
+    if log_file:
+        line = json.dumps(entry, default=str)
+        with _log_lock:
+            with open(log_file, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+def get_recent_traces(limit: int = None) -> List[dict]:
+    """The most recent recorded traces, oldest first"""
+    with _recent_lock:
+        traces = list(_recent)
+    return traces[-limit:] if limit else traces
+
+
+def setup_logging(level: str = None):
+    """
+        Configure logging for an entry point from LOG_LEVEL (default WARNING).
+        DEBUG also logs every traced query.
+    """
+    level = (level or os.getenv("LOG_LEVEL") or "WARNING").upper()
+    logging.basicConfig(level=level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")